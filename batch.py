@@ -0,0 +1,79 @@
+from decimal import getcontext
+
+from vector import to_number
+from linsys import LinearSystem, _forward_eliminate
+
+getcontext().prec = 30
+
+
+def _solve_one(coefficients, constants):
+    # the same steps as LinearSystem.compute_solution, on plain lists
+    rows = [list(a) + [k] for a, k in zip(coefficients, constants)]
+    num_variables = len(rows[0]) - 1 if rows else 0
+
+    pivot_columns, determinant, is_consistent = _forward_eliminate(rows, num_variables)
+    if not is_consistent:
+        return None, LinearSystem.NO_SOLUTIONS_MSG
+
+    for i in range(len(pivot_columns))[::-1]:
+        j = pivot_columns[i]
+        beta = 1/rows[i][j]
+        pivot_row = rows[i] = [beta*x for x in rows[i]]
+        for k in range(i)[::-1]:
+            alpha = -rows[k][j]
+            rows[k] = [alpha*x + y for x, y in zip(pivot_row, rows[k])]
+
+    solution = [0] * num_variables
+    for i, j in enumerate(pivot_columns):
+        solution[j] = rows[i][num_variables]
+
+    if len(pivot_columns) < num_variables:
+        return tuple(solution), LinearSystem.INF_SOLUTIONS_MSG
+
+    return tuple(solution), LinearSystem.UNIQUE_SOLUTION_MSG
+
+
+def solve_batch(coefficients, constants):
+    """
+        solves N independent systems given as stacked coefficient (N, k, k)
+        and constant (N, k) sequences
+
+        returns (solutions, statuses); statuses use the LinearSystem
+        messages, solutions hold the unique solution, the basepoint of the
+        parameterization when there are infinitely many, or None
+    """
+    solutions = []
+    statuses = []
+
+    for a, b in zip(coefficients, constants):
+        solution, status = _solve_one(a, b)
+        solutions.append(solution)
+        statuses.append(status)
+
+    return solutions, statuses
+
+
+def solve_planes_batch(systems):
+    """
+        solve_batch for sequences of Line/Plane/Hyperplane rows, e.g. the
+        line pairs of Line.intersection_with or three-plane intersections
+    """
+    coefficients = [[p.normal_vector.coordinates for p in rows] for rows in systems]
+    constants = [[to_number(p.constant_term, p.normal_vector.number) for p in rows]
+                 for rows in systems]
+
+    return solve_batch(coefficients, constants)
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from linsys import _check_systems
+
+    for number in NUMERIC_BACKENDS:
+        for kind, system in _check_systems(number):
+            expected = system.compute_solution()
+            solutions, statuses = solve_planes_batch([system.planes])
+            if statuses[0] != system.solution_kind():
+                print('solve_planes_batch {} {} failed'.format(number.__name__, kind))
+            elif solutions[0] is not None and not all(expected.contains([solutions[0]])):
+                print('solve_planes_batch {} {} failed'.format(number.__name__, kind))
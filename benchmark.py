@@ -0,0 +1,137 @@
+import random
+import time
+from copy import deepcopy
+from decimal import Decimal
+from fractions import Fraction
+from multiprocessing import cpu_count
+
+from vector import Vector
+from hyperplane import Hyperplane
+from linsys import LinearSystem, DenseLinearSystem
+from parallel import solve_in_parallel
+
+
+def random_planes(num_equations, dimension, seed=0):
+    rng = random.Random(seed)
+    return [Hyperplane(normal_vector=Vector([str(rng.randint(-9, 9)) for _ in range(dimension)]),
+                       constant_term=str(rng.randint(-9, 9)))
+            for _ in range(num_equations)]
+
+
+def peak_allocation(setup, func):
+    import tracemalloc
+    arg = setup()
+    tracemalloc.start()
+    try:
+        func(arg)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def elapsed(setup, func):
+    arg = setup()
+    start = time.time()
+    func(arg)
+    return time.time() - start
+
+
+"""
+    peak allocation of compute_rref before and after dropping the deep clone
+"""
+def bench_rref_memory(num_equations=40, dimension=40):
+    try:
+        import tracemalloc
+    except ImportError:
+        print('compute_rref on {}x{}: skipped, tracemalloc needs Python 3'.format(num_equations, dimension))
+        return
+
+    planes = random_planes(num_equations, dimension)
+
+    def system():
+        return LinearSystem(list(planes))
+
+    def dense_system():
+        return DenseLinearSystem(planes)
+
+    cases = [
+        ('deepcopy (before)', system, lambda s: deepcopy(s).compute_rref(inplace=True)),
+        ('copy-on-write', system, lambda s: s.compute_rref()),
+        ('inplace', system, lambda s: s.compute_rref(inplace=True)),
+        ('dense deepcopy (before)', dense_system, lambda s: deepcopy(s).compute_rref(inplace=True)),
+        ('dense copy', dense_system, lambda s: s.compute_rref()),
+        ('dense inplace', dense_system, lambda s: s.compute_rref(inplace=True)),
+    ]
+
+    print('compute_rref on {}x{}'.format(num_equations, dimension))
+    for name, setup, func in cases:
+        print('  {:<26} peak {:>10} bytes  {:.3f}s'.format(
+            name, peak_allocation(setup, func), elapsed(setup, func)))
+
+
+"""
+    wall time of the shared-memory blocked LU for each number of worker
+    processes; the ratios only mean something on a machine with that many
+    cores, so the core count is printed with them
+"""
+def bench_parallel_elimination(dimension=300, processes=(1, 2, 4, 8), block_size=64):
+    system = LinearSystem(random_planes(dimension, dimension, seed=1))
+
+    print('parallel elimination on {0}x{0}, block size {1}, cpu_count {2}'.format(
+        dimension, block_size, cpu_count()))
+    baseline = None
+    for p in processes:
+        seconds = elapsed(lambda: system, lambda s: solve_in_parallel(s, p, block_size))
+        if baseline is None:
+            baseline = seconds
+        print('  {:>2} processes  {:.3f}s  ratio to 1 process {:.2f}'.format(p, seconds, baseline / seconds))
+
+
+FLOAT_SPEEDUP_TARGET = 10
+
+
+"""
+    the same Vector and LinearSystem work on each numeric backend
+
+    the target was float at least 10x faster than Decimal; it is not met on
+    Python 3, where the decimal module is C code and float wins about 3x;
+    under Python 2, whose decimal is pure Python, float wins 20x and more
+"""
+def bench_numeric_backends(num_vectors=2000, dimension=3, system_size=20):
+    rng = random.Random(0)
+    values = [[repr(rng.uniform(-10, 10)) for _ in range(dimension)] for _ in range(num_vectors)]
+    planes = random_planes(system_size, system_size, seed=2)
+
+    def vector_work(vectors):
+        for v, w in zip(vectors, vectors[1:]):
+            v.plus(w).minus(w).times_scalar(3)
+            v.dot(w)
+            v.magnitude()
+            v.cross(w)
+            v.angle_with(w)
+
+    def system(number, system_class=LinearSystem):
+        return lambda: system_class([p.__class__(normal_vector=Vector(p.normal_vector.coordinates, number),
+                                                 constant_term=p.constant_term) for p in planes])
+
+    print('numeric backends: {} vector pairs in R{}, {}x{} compute_solution'.format(
+        num_vectors, dimension, system_size, system_size))
+    timings = {}
+    for number in (Decimal, float, Fraction):
+        vectors = elapsed(lambda: [Vector(v, number) for v in values], vector_work)
+        solve = elapsed(system(number), lambda s: s.compute_solution())
+        dense_solve = elapsed(system(number, DenseLinearSystem), lambda s: s.compute_solution(inplace=True))
+        timings[number] = (vectors, solve, dense_solve)
+        print('  {:<8} vectors {:.3f}s  solve {:.3f}s  dense solve {:.3f}s'.format(
+            number.__name__, vectors, solve, dense_solve))
+
+    speedups = [d / f for d, f in zip(timings[Decimal], timings[float])]
+    print('  float speedup over Decimal: vectors {:.1f}x  solve {:.1f}x  dense solve {:.1f}x'.format(*speedups))
+    if min(speedups) < FLOAT_SPEEDUP_TARGET:
+        print('  target of {}x not met'.format(FLOAT_SPEEDUP_TARGET))
+
+
+if __name__ == '__main__':
+    bench_rref_memory()
+    bench_parallel_elimination()
+    bench_numeric_backends()
@@ -0,0 +1,146 @@
+from decimal import getcontext
+from multiprocessing import Pool
+
+from vector import Vector, is_near_zero
+from hyperplane import Hyperplane
+from linsys import LinearSystem, Parameterization
+
+getcontext().prec = 30
+
+
+def find_independent_blocks(system):
+    """
+        connected components of the equation-variable incidence graph
+
+        returns (blocks, zero_rows, free_variables): blocks is a list of
+        (row indices, variable indices) pairs sharing no variables,
+        zero_rows lists equations without nonzero coefficients and
+        free_variables the variables that appear in no equation
+    """
+    num_variables = system.dimension
+    parent = list(range(num_variables))
+
+    def find(j):
+        while parent[j] != j:
+            parent[j] = parent[parent[j]]
+            j = parent[j]
+        return j
+
+    row_variables = []
+    for i in range(len(system)):
+        variables = [j for j, x in enumerate(system._row_coefficients(i))
+                     if not is_near_zero(x)]
+        row_variables.append(variables)
+        for j in variables[1:]:
+            root_a, root_b = find(variables[0]), find(j)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    used = set()
+    for variables in row_variables:
+        used.update(variables)
+
+    components = {}
+    for j in sorted(used):
+        components.setdefault(find(j), ([], []))[1].append(j)
+
+    zero_rows = []
+    for i, variables in enumerate(row_variables):
+        if variables:
+            components[find(variables[0])][0].append(i)
+        else:
+            zero_rows.append(i)
+
+    blocks = [components[root] for root in sorted(components)]
+    free_variables = [j for j in range(num_variables) if j not in used]
+
+    return blocks, zero_rows, free_variables
+
+
+def _solve_block(block):
+    # runs in a worker process; returns 'No solutions' or the basepoint and
+    # (free variable, direction) pairs in block-local indices
+    dimension, number, rows = block
+    system = LinearSystem([Hyperplane(normal_vector=Vector(coefficients, number), constant_term=constant_term)
+                           for coefficients, constant_term in rows])
+    rref = system.compute_rref(inplace=True)
+
+    try:
+        rref.raise_exception_if_contradictory_equation()
+    except Exception as e:
+        if str(e) == LinearSystem.NO_SOLUTIONS_MSG:
+            return str(e)
+        raise e
+
+    pivot_indices = rref.indices_of_first_nonzero_terms_in_each_row()
+    free_variable_indices = sorted(set(range(dimension)) - set(pivot_indices))
+    direction_vectors = rref.extract_direction_vectors_for_parameterization()
+
+    return (rref.extract_basepoint_for_parameterization().coordinates,
+            [(free_var, v.coordinates) for free_var, v in zip(free_variable_indices, direction_vectors)])
+
+
+def solve_blocks(system, processes=None):
+    """
+        solves each independent block of the system on its own, across a
+        process pool when there is more than one block, and merges the
+        results into one Parameterization or 'No solutions'
+    """
+    blocks, zero_rows, free_variables = find_independent_blocks(system)
+
+    for i in zero_rows:
+        if not is_near_zero(system._constant_term(i)):
+            return LinearSystem.NO_SOLUTIONS_MSG
+
+    tasks = []
+    for rows, variables in blocks:
+        tasks.append((len(variables), system.number,
+                      [([system._coefficient(i, j) for j in variables], system._constant_term(i))
+                       for i in rows]))
+
+    if processes == 1 or len(tasks) < 2:
+        results = [_solve_block(task) for task in tasks]
+    else:
+        pool = Pool(processes)
+        try:
+            results = pool.map(_solve_block, tasks)
+        finally:
+            pool.close()
+            pool.join()
+
+    num_variables = system.dimension
+    basepoint_coords = [0] * num_variables
+    directions = []
+
+    for (rows, variables), result in zip(blocks, results):
+        if result == LinearSystem.NO_SOLUTIONS_MSG:
+            return result
+
+        basepoint, block_directions = result
+        for j, x in zip(variables, basepoint):
+            basepoint_coords[j] = x
+        for free_var, coordinates in block_directions:
+            vector_coords = [0] * num_variables
+            for j, x in zip(variables, coordinates):
+                vector_coords[j] = x
+            directions.append((variables[free_var], vector_coords))
+
+    for free_var in free_variables:
+        vector_coords = [0] * num_variables
+        vector_coords[free_var] = 1
+        directions.append((free_var, vector_coords))
+
+    directions.sort(key=lambda d: d[0])
+
+    return Parameterization(Vector(basepoint_coords, system.number),
+                            [Vector(coords, system.number) for free_var, coords in directions])
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from linsys import _check_systems, _same_solution
+
+    for number in NUMERIC_BACKENDS:
+        for kind, system in _check_systems(number):
+            if not _same_solution(solve_blocks(system, processes=1), system.compute_solution()):
+                print('solve_blocks {} {} failed'.format(number.__name__, kind))
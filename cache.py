@@ -0,0 +1,215 @@
+import os
+import pickle
+import hashlib
+from collections import OrderedDict
+from decimal import Decimal, getcontext
+
+from vector import to_number
+
+getcontext().prec = 30
+
+
+def fingerprint(system, kind='solution'):
+    """
+        sha256 over the system's class, numeric backend, shape and every
+        coefficient and constant term rounded to the current Decimal
+        precision, so equal systems hash equally across processes and
+        restarts
+    """
+    context = getcontext()
+    digest = hashlib.sha256()
+    header = '%s|%s|%s|%d|%d|%d' % (kind, system.__class__.__name__, system.number.__name__,
+                                    context.prec, len(system), system.dimension)
+    digest.update(header.encode('ascii'))
+
+    for i in range(len(system)):
+        terms = list(system._row_coefficients(i)) + [system._constant_term(i)]
+        text = ','.join([str(context.plus(to_number(x, Decimal)).normalize()) for x in terms])
+        digest.update(('|' + text).encode('ascii'))
+
+    return digest.hexdigest()
+
+
+class SolutionCache(object):
+    """
+        least-recently-used cache of solved systems, bounded by entry count
+        and by the pickled size of the stored values, with an optional
+        directory of pickles that outlives the process; every put prunes
+        the directory to the same two limits, oldest files first
+
+        assign an instance to LinearSystem.solution_cache (or to a single
+        system) to route compute_solution and compute_rref through it
+
+        files in directory are unpickled, which runs whatever code they
+        name: the directory must be writable only by the service itself
+    """
+
+    def __init__(self, maxsize=128, max_bytes=None, directory=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        if directory is not None and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.pickle')
+
+    def _store(self, key, value, size):
+        if key in self.entries:
+            self.current_bytes -= self.entries.pop(key)[1]
+
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        self.entries[key] = (value, size)
+        self.current_bytes += size
+
+        while (len(self.entries) > self.maxsize or
+               (self.max_bytes is not None and self.current_bytes > self.max_bytes)):
+            evicted_key, (evicted, evicted_size) = self.entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+
+    def get(self, key, default=None):
+        if key in self.entries:
+            value, size = self.entries.pop(key)
+            self.entries[key] = (value, size)
+            self.hits += 1
+            return value
+
+        if self.directory is not None and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), 'rb') as f:
+                    data = f.read()
+                # a disk hit counts as a use when the directory is pruned
+                os.utime(self._path(key), None)
+            except (IOError, OSError):
+                # pruned by another process in the meantime
+                self.misses += 1
+                return default
+            value = pickle.loads(data)
+            self._store(key, value, len(data))
+            self.hits += 1
+            self.disk_hits += 1
+            return value
+
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self._store(key, value, len(data))
+
+        if self.directory is not None:
+            if self.max_bytes is not None and len(data) > self.max_bytes:
+                return
+            # write then rename so a concurrent reader never sees half a file
+            path = self._path(key)
+            temporary = '%s.%d.tmp' % (path, os.getpid())
+            with open(temporary, 'wb') as f:
+                f.write(data)
+            os.rename(temporary, path)
+            self._prune_directory(path, len(data))
+
+    def _prune_directory(self, kept_path, kept_size):
+        # least recently used first, by modification time; the file just
+        # written always stays
+        files = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not name.endswith('.pickle') or path == kept_path:
+                continue
+            try:
+                status = os.stat(path)
+            except OSError:
+                continue
+            files.append((status.st_mtime, path, status.st_size))
+        files.sort()
+
+        count = len(files) + 1
+        total = sum([size for mtime, path, size in files]) + kept_size
+        for mtime, path, size in files:
+            if count <= self.maxsize and (self.max_bytes is None or total <= self.max_bytes):
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # already removed by another process
+                pass
+            count -= 1
+            total -= size
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key, self)
+        if value is self:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        self.entries.clear()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'disk_hits': self.disk_hits,
+                'entries': len(self.entries), 'bytes': self.current_bytes}
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from linsys import _check_systems, _same_solution
+
+    for number in NUMERIC_BACKENDS:
+        for kind, system in _check_systems(number):
+            expected = system.compute_solution()
+            system.solution_cache = SolutionCache()
+            first = system.compute_solution()
+            second = system.compute_solution()
+            if not (_same_solution(first, expected) and _same_solution(second, expected) and
+                    system.solution_cache.info()['hits'] == 1):
+                print('solution_cache {} {} failed'.format(number.__name__, kind))
+
+    import shutil
+    import tempfile
+
+    directory = tempfile.mkdtemp()
+    try:
+        cache = SolutionCache(maxsize=2, directory=directory)
+        for key in ['a', 'b', 'c']:
+            cache.put(key, [key] * 10)
+        if sorted(os.listdir(directory)) != ['b.pickle', 'c.pickle']:
+            print('solution_cache directory maxsize failed')
+
+        size = len(pickle.dumps(['x'] * 10, pickle.HIGHEST_PROTOCOL))
+        cache = SolutionCache(maxsize=10, max_bytes=2*size, directory=directory)
+        for key in ['d', 'e', 'f']:
+            cache.put(key, [key] * 10)
+        names = sorted(os.listdir(directory))
+        total = sum([os.path.getsize(os.path.join(directory, name)) for name in names])
+        if 'f.pickle' not in names or total > 2*size:
+            print('solution_cache directory max_bytes failed')
+
+        cache = SolutionCache(maxsize=10, max_bytes=size - 1, directory=directory)
+        cache.put('g', ['g'] * 10)
+        if os.path.exists(os.path.join(directory, 'g.pickle')):
+            print('solution_cache directory oversized value failed')
+    finally:
+        shutil.rmtree(directory)
+
+    systems = [_check_systems(number)[0][1] for number in NUMERIC_BACKENDS]
+    if len(set([fingerprint(system) for system in systems])) != len(systems):
+        print('fingerprint per backend failed')
@@ -0,0 +1,152 @@
+from math import ceil, log10
+from decimal import getcontext, localcontext
+
+from lu import LUFactorization
+from exact import ExactLinearSystem
+
+getcontext().prec = 30
+
+# unit roundoff of IEEE double precision
+FLOAT_ROUNDOFF = 2.0 ** -53
+
+
+def one_norm(system):
+    columns = [0.0] * system.dimension
+    for i in range(len(system)):
+        for j, x in enumerate(system._row_coefficients(i)):
+            columns[j] += abs(float(x))
+    return max(columns)
+
+
+def estimate_inverse_one_norm(factorization, max_iterations=5):
+    """
+        Hager's estimate of ||A^-1||_1 from a few solves with A and A^T,
+        checked against Higham's alternating vector
+    """
+    n = factorization.dimension
+    x = [1.0 / n] * n
+    estimate = 0.0
+    visited = set()
+
+    for iteration in range(max_iterations):
+        y = factorization.solve_coordinates(x)
+        estimate = max(estimate, sum([abs(v) for v in y]))
+
+        signs = [1.0 if v >= 0 else -1.0 for v in y]
+        z = factorization.solve_transpose_coordinates(signs)
+        j = max(range(n), key=lambda k: abs(z[k]))
+        if abs(z[j]) <= sum([a*b for a, b in zip(z, x)]) or j in visited:
+            break
+
+        visited.add(j)
+        x = [0.0] * n
+        x[j] = 1.0
+
+    if n > 1:
+        b = [(-1) ** i * (1 + float(i) / (n - 1)) for i in range(n)]
+        y = factorization.solve_coordinates(b)
+        estimate = max(estimate, 2 * sum([abs(v) for v in y]) / (3 * n))
+
+    return estimate
+
+
+def estimate_condition_number(system, factorization=None):
+    """
+        1-norm condition number estimate from a float64 LU factorization;
+        infinite for non-square and numerically singular systems
+    """
+    n = system.dimension
+    if len(system) != n:
+        return float('inf')
+
+    if factorization is None:
+        factorization = LUFactorization(system, number=float)
+    if factorization.rank < n:
+        return float('inf')
+
+    return one_norm(system) * estimate_inverse_one_norm(factorization)
+
+
+class ArithmeticChoice(object):
+    """
+        the cheapest arithmetic expected to give `digits` correct
+        significant digits, with the condition estimate behind the choice:
+        about log10(condition) + log10(n) + 1 digits are lost to rounding
+    """
+
+    FLOAT = 'float64'
+    DECIMAL = 'decimal'
+    EXACT = 'exact'
+
+    # a float64 estimate near 1/roundoff is itself unreliable
+    MAX_TRUSTED_FLOAT_CONDITION = 1e-2 / FLOAT_ROUNDOFF
+    MAX_DECIMAL_PRECISION = 200
+
+    def __init__(self, system, digits=10):
+        self.digits = digits
+        self.factorization = LUFactorization(system, number=float)
+        self.condition_estimate = estimate_condition_number(system, self.factorization)
+
+        n = system.dimension
+        if self.condition_estimate > self.MAX_TRUSTED_FLOAT_CONDITION:
+            self.digits_lost = None
+            self.mode = self.EXACT
+            self.precision = None
+            return
+
+        self.digits_lost = log10(max(self.condition_estimate, 1.0)) + log10(n) + 1
+        needed = int(ceil(digits + self.digits_lost))
+
+        if needed <= -log10(FLOAT_ROUNDOFF):
+            self.mode = self.FLOAT
+            self.precision = None
+        elif needed <= self.MAX_DECIMAL_PRECISION:
+            self.mode = self.DECIMAL
+            self.precision = needed
+        else:
+            self.mode = self.EXACT
+            self.precision = None
+
+    def __str__(self):
+        ret = '{} for {} digits (condition estimate {:.3g}'.format(
+            self.mode, self.digits, self.condition_estimate)
+        if self.precision is not None:
+            ret += ', precision {}'.format(self.precision)
+        return ret + ')'
+
+
+def solve_with_digits(system, digits=10):
+    """
+        returns (solution, ArithmeticChoice) with the solution computed in
+        the chosen arithmetic
+    """
+    choice = ArithmeticChoice(system, digits)
+    constant_terms = [system._constant_term(i) for i in range(len(system))]
+
+    if choice.mode == choice.FLOAT:
+        return choice.factorization.solve([float(k) for k in constant_terms]), choice
+
+    if choice.mode == choice.DECIMAL:
+        with localcontext() as context:
+            context.prec = choice.precision
+            factorization = LUFactorization(system)
+            return factorization.solve(constant_terms), choice
+
+    with localcontext() as context:
+        context.prec = max(context.prec, digits + 5)
+        return ExactLinearSystem(system).compute_solution(), choice
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from linsys import _check_systems, _same_solution
+
+    for number in NUMERIC_BACKENDS:
+        for kind, system in _check_systems(number):
+            for digits in (10, 20):
+                solution, choice = solve_with_digits(system, digits)
+                if not _same_solution(solution, system.compute_solution()):
+                    print('solve_with_digits {} {} {} failed'.format(digits, number.__name__, kind))
+            finite = estimate_condition_number(system) < float('inf')
+            if finite != (kind == 'unique'):
+                print('estimate_condition_number {} {} failed'.format(number.__name__, kind))
@@ -0,0 +1,296 @@
+import time
+import pickle
+from decimal import getcontext
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Client, Listener
+
+from vector import Vector, is_near_zero
+from linsys import LinearSystem, Parameterization
+
+getcontext().prec = 30
+
+
+class Transport(object):
+    """
+        point-to-point messages between the ranks 0..size-1 of a job,
+        pickled and counted; subclasses move the bytes
+    """
+
+    def __init__(self, rank, size):
+        self.rank = rank
+        self.size = size
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def send_bytes(self, destination, data):
+        raise NotImplementedError
+
+    def recv_bytes(self, source):
+        raise NotImplementedError
+
+    def send(self, destination, message):
+        data = pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+        self.send_bytes(destination, data)
+        self.bytes_sent += len(data)
+
+    def recv(self, source):
+        data = self.recv_bytes(source)
+        self.bytes_received += len(data)
+        return pickle.loads(data)
+
+    def broadcast(self, message, root):
+        if self.rank != root:
+            return self.recv(root)
+
+        data = pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+        for destination in range(self.size):
+            if destination != root:
+                self.send_bytes(destination, data)
+                self.bytes_sent += len(data)
+        return message
+
+    def close(self):
+        pass
+
+
+class ConnectionTransport(Transport):
+    """
+        one multiprocessing connection per peer: Pipe ends between local
+        processes (pipe_mesh) or authenticated sockets between hosts
+        (socket_transport)
+    """
+
+    def __init__(self, rank, size, connections):
+        Transport.__init__(self, rank, size)
+        self.connections = connections
+
+    def send_bytes(self, destination, data):
+        self.connections[destination].send_bytes(data)
+
+    def recv_bytes(self, source):
+        return self.connections[source].recv_bytes()
+
+    def close(self):
+        for connection in self.connections.values():
+            connection.close()
+
+
+def pipe_mesh(size):
+    connections = [{} for rank in range(size)]
+    for a in range(size):
+        for b in range(a+1, size):
+            connections[a][b], connections[b][a] = Pipe()
+    return [ConnectionTransport(rank, size, connections[rank]) for rank in range(size)]
+
+
+def socket_transport(rank, addresses, authkey, retry_seconds=30):
+    """
+        rank listens on addresses[rank], dials every lower rank and accepts
+        every higher one
+
+        messages are unpickled, so authkey is the only thing keeping other
+        hosts from running code on the ranks: use a secret per job
+    """
+    size = len(addresses)
+    listener = Listener(addresses[rank], authkey=authkey)
+    connections = {}
+
+    for peer in range(rank):
+        deadline = time.time() + retry_seconds
+        while True:
+            try:
+                connection = Client(addresses[peer], authkey=authkey)
+                break
+            except (IOError, OSError):
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.05)
+        connection.send(rank)
+        connections[peer] = connection
+
+    for k in range(rank+1, size):
+        connection = listener.accept()
+        connections[connection.recv()] = connection
+
+    listener.close()
+    return ConnectionTransport(rank, size, connections)
+
+
+class DistributedElimination(object):
+    """
+        Gauss-Jordan elimination with rows dealt block-cyclically over the
+        ranks of a transport; pivot choices, row swaps and row updates
+        follow compute_triangular_form and compute_rref step for step, so
+        the result matches compute_solution exactly
+
+        swaps only permute the shared row order, never move row data; each
+        pivot row is broadcast once for clearing below and once, scaled,
+        for clearing above
+    """
+
+    def __init__(self, transport, block_size=4):
+        self.transport = transport
+        self.block_size = block_size
+
+    def owner(self, row_id):
+        return (row_id // self.block_size) % self.transport.size
+
+    def _first_pivot_position(self, rows, where, i, j):
+        # position of the first row at or below position i whose entry in
+        # column j is not near zero, minimised over all ranks
+        transport = self.transport
+        positions = [where[row_id] for row_id, row in rows.items()
+                     if where[row_id] >= i and not is_near_zero(row[j])]
+        local = min(positions) if positions else self.num_equations
+
+        if transport.rank != 0:
+            transport.send(0, local)
+            return transport.recv(0)
+
+        first = min([local] + [transport.recv(rank) for rank in range(1, transport.size)])
+        return transport.broadcast(first, 0)
+
+    def eliminate(self, rows, num_equations, dimension):
+        """
+            reduces the rows owned by this rank (row id -> list of
+            coefficients and constant term) in place; returns the final row
+            order and the (position, column) of every pivot
+        """
+        self.num_equations = num_equations
+        order = list(range(num_equations))
+        where = list(range(num_equations))
+        pivots = []
+
+        j = 0
+        for i in range(num_equations):
+            while j < dimension:
+                k = self._first_pivot_position(rows, where, i, j)
+                if k == num_equations:
+                    j += 1
+                    continue
+
+                if k != i:
+                    order[i], order[k] = order[k], order[i]
+                    where[order[i]], where[order[k]] = i, k
+
+                pivot_id = order[i]
+                pivot_row = self.transport.broadcast(rows.get(pivot_id), self.owner(pivot_id))
+                beta = pivot_row[j]
+                for row_id, row in rows.items():
+                    if where[row_id] > i and row[j]:
+                        alpha = -row[j]/beta
+                        rows[row_id] = [alpha*p + x for p, x in zip(pivot_row, row)]
+
+                pivots.append((i, j))
+                j += 1
+                break
+
+        for i, j in pivots[::-1]:
+            pivot_id = order[i]
+            pivot_row = rows.get(pivot_id)
+            if pivot_row is not None:
+                beta = 1/pivot_row[j]
+                pivot_row = [beta*x for x in pivot_row]
+                rows[pivot_id] = pivot_row
+            pivot_row = self.transport.broadcast(pivot_row, self.owner(pivot_id))
+
+            for row_id, row in rows.items():
+                if where[row_id] < i and row[j]:
+                    alpha = -(row[j])
+                    rows[row_id] = [alpha*p + x for p, x in zip(pivot_row, row)]
+
+        return order, pivots
+
+
+def _run_worker(transport, block_size):
+    message = transport.recv(0)
+    getcontext().prec = message['precision']
+
+    start = time.time()
+    elimination = DistributedElimination(transport, block_size)
+    rows = message['rows']
+    elimination.eliminate(rows, message['num_equations'], message['dimension'])
+    seconds = time.time() - start
+
+    transport.send(0, rows)
+    transport.send(0, {'rank': transport.rank, 'rows': len(rows), 'seconds': seconds,
+                       'bytes_sent': transport.bytes_sent,
+                       'bytes_received': transport.bytes_received})
+    transport.close()
+
+
+def solve_distributed(system, processes=2, block_size=4):
+    """
+        runs DistributedElimination with rank 0 in this process and the
+        other ranks in local processes over a pipe mesh
+
+        returns (solution, report) where report holds one dict per rank with
+        its row count, elimination seconds and bytes sent and received
+    """
+    num_equations = len(system)
+    dimension = system.dimension
+    transports = pipe_mesh(processes)
+    transport = transports[0]
+    elimination = DistributedElimination(transport, block_size)
+
+    workers = [Process(target=_run_worker, args=(transports[rank], block_size))
+               for rank in range(1, processes)]
+    for worker in workers:
+        worker.start()
+
+    scattered = [{} for rank in range(processes)]
+    for i in range(num_equations):
+        row = list(system._row_coefficients(i)) + [system._constant_term(i)]
+        scattered[elimination.owner(i)][i] = row
+    for rank in range(1, processes):
+        transport.send(rank, {'precision': getcontext().prec, 'rows': scattered[rank],
+                              'num_equations': num_equations, 'dimension': dimension})
+
+    start = time.time()
+    rows = scattered[0]
+    num_rows = len(rows)
+    order, pivots = elimination.eliminate(rows, num_equations, dimension)
+    seconds = time.time() - start
+
+    report = [None] * processes
+    for rank in range(1, processes):
+        rows.update(transport.recv(rank))
+        report[rank] = transport.recv(rank)
+    report[0] = {'rank': 0, 'rows': num_rows, 'seconds': seconds,
+                 'bytes_sent': transport.bytes_sent, 'bytes_received': transport.bytes_received}
+
+    for worker in workers:
+        worker.join()
+    for other in transports:
+        other.close()
+
+    row_type = system[0].__class__
+    rref = LinearSystem([row_type(normal_vector=Vector(rows[row_id][:dimension], system.number),
+                                  constant_term=rows[row_id][dimension])
+                         for row_id in order])
+    rref._pivot_indices = [-1] * num_equations
+    for i, j in pivots:
+        rref._pivot_indices[i] = j
+
+    try:
+        rref.raise_exception_if_contradictory_equation()
+    except Exception as e:
+        if str(e) == LinearSystem.NO_SOLUTIONS_MSG:
+            return str(e), report
+        raise e
+
+    direction_vectors = rref.extract_direction_vectors_for_parameterization()
+    basepoint = rref.extract_basepoint_for_parameterization()
+
+    return Parameterization(basepoint, direction_vectors), report
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from linsys import _check_systems, _same_solution
+
+    for number in NUMERIC_BACKENDS:
+        for kind, system in _check_systems(number):
+            solution, report = solve_distributed(system, processes=2, block_size=1)
+            if not _same_solution(solution, system.compute_solution()):
+                print('solve_distributed {} {} failed'.format(number.__name__, kind))
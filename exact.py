@@ -0,0 +1,170 @@
+from fractions import Fraction
+from decimal import Decimal, getcontext
+
+from vector import Vector
+from linsys import LinearSystem, Parameterization
+
+getcontext().prec = 30
+
+
+def gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return abs(a)
+
+
+def lcm(a, b):
+    return a // gcd(a, b) * b
+
+
+def to_decimal(x):
+    if isinstance(x, Fraction):
+        return Decimal(x.numerator) / Decimal(x.denominator)
+    return Decimal(x)
+
+
+class ExactLinearSystem(object):
+    """
+        fraction-free (Bareiss) elimination of a LinearSystem on Python
+        ints; Decimal coefficients are read exactly as rationals and each
+        row is scaled by the lcm of its denominators, so pivots and ranks
+        are exact and no near-zero tolerance is needed
+    """
+
+    def __init__(self, system):
+        self.dimension = system.dimension
+        self.number = system.number
+        self.rows = []
+
+        for i in range(len(system)):
+            row = [Fraction(x) for x in system._row_coefficients(i)]
+            row.append(Fraction(system._constant_term(i)))
+
+            denominator = 1
+            for x in row:
+                denominator = lcm(denominator, x.denominator)
+            self.rows.append([int(x * denominator) for x in row])
+
+        self._triangular_form = None
+
+    def compute_triangular_form(self):
+        """
+            returns (rows, pivot_columns); every entry of rows is an integer
+            minor of the augmented matrix, the last pivot is +/- the
+            determinant for square nonsingular systems
+        """
+        if self._triangular_form is not None:
+            return self._triangular_form
+
+        rows = [list(row) for row in self.rows]
+        num_equations = len(rows)
+        num_variables = self.dimension
+        width = num_variables + 1
+
+        pivot_columns = []
+        previous_pivot = 1
+        r = 0
+
+        for c in range(num_variables):
+            if r == num_equations:
+                break
+
+            for p in range(r, num_equations):
+                if rows[p][c]:
+                    break
+            else:
+                continue
+
+            rows[r], rows[p] = rows[p], rows[r]
+            pivot_row = rows[r]
+            pivot = pivot_row[c]
+
+            for i in range(r+1, num_equations):
+                row = rows[i]
+                factor = row[c]
+                for j in range(c+1, width):
+                    row[j] = (pivot * row[j] - factor * pivot_row[j]) // previous_pivot
+                row[c] = 0
+
+            previous_pivot = pivot
+            pivot_columns.append(c)
+            r += 1
+
+        self._triangular_form = (rows, pivot_columns)
+        return self._triangular_form
+
+    def rank(self):
+        return len(self.compute_triangular_form()[1])
+
+    def is_consistent(self):
+        rows, pivot_columns = self.compute_triangular_form()
+        return not [row for row in rows[len(pivot_columns):] if row[-1]]
+
+    def _back_substitute(self, x, homogeneous):
+        rows, pivot_columns = self.compute_triangular_form()
+        num_variables = self.dimension
+
+        for k in range(len(pivot_columns))[::-1]:
+            c = pivot_columns[k]
+            row = rows[k]
+            if homogeneous:
+                total = Fraction(0)
+            else:
+                total = Fraction(row[num_variables])
+            for j in range(c+1, num_variables):
+                if x[j]:
+                    total -= row[j] * x[j]
+            x[c] = total / row[c]
+
+        return x
+
+    def compute_exact_solution(self):
+        """
+            the basepoint and direction vectors as lists of Fractions, or
+            LinearSystem.NO_SOLUTIONS_MSG
+        """
+        if not self.is_consistent():
+            return LinearSystem.NO_SOLUTIONS_MSG
+
+        num_variables = self.dimension
+        pivot_columns = self.compute_triangular_form()[1]
+
+        basepoint = self._back_substitute([Fraction(0)] * num_variables, False)
+
+        direction_vectors = []
+        for free_var in sorted(set(range(num_variables)) - set(pivot_columns)):
+            x = [Fraction(0)] * num_variables
+            x[free_var] = Fraction(1)
+            direction_vectors.append(self._back_substitute(x, True))
+
+        return basepoint, direction_vectors
+
+    def compute_solution(self, number=None):
+        """
+            Parameterization in the system's numeric backend, or in
+            number; with Fraction it is exact
+        """
+        solution = self.compute_exact_solution()
+        if solution == LinearSystem.NO_SOLUTIONS_MSG:
+            return solution
+
+        if number is None:
+            number = self.number
+        convert = to_decimal if number is Decimal else number
+
+        basepoint, direction_vectors = solution
+        return Parameterization(Vector([convert(x) for x in basepoint], number),
+                                [Vector([convert(x) for x in v], number) for v in direction_vectors])
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from linsys import _check_systems, _same_solution
+
+    for number in NUMERIC_BACKENDS:
+        for kind, system in _check_systems(number):
+            expected = system.compute_solution()
+            if not _same_solution(ExactLinearSystem(system).compute_solution(), expected):
+                print('compute_solution {} {} failed'.format(number.__name__, kind))
+            if not _same_solution(ExactLinearSystem(system).compute_solution(Fraction), expected):
+                print('compute_solution(Fraction) {} {} failed'.format(number.__name__, kind))
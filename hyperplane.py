@@ -1,6 +1,6 @@
 from decimal import Decimal, getcontext
 
-from vector import Vector
+from vector import Vector, to_number, is_near_zero
 
 getcontext().prec = 30
 
@@ -24,7 +24,7 @@ class Hyperplane(object):
 
         if not constant_term:
             constant_term = '0'
-        self.constant_term = MyDecimal(constant_term)
+        self.constant_term = to_number(constant_term, normal_vector.number)
 
         self.set_basepoint()
 
@@ -39,8 +39,8 @@ class Hyperplane(object):
             initial_index = Hyperplane.first_nonzero_index(list(n.coordinates))
             initial_coefficient = self.get_nth_coefficient(initial_index)
 
-            basepoint_coords[initial_index] = MyDecimal(c)/initial_coefficient
-            self.basepoint = Vector(basepoint_coords)
+            basepoint_coords[initial_index] = c/initial_coefficient
+            self.basepoint = Vector(basepoint_coords, n.number)
 
         except Exception as e:
             if str(e) == Hyperplane.NO_NONZERO_ELTS_FOUND_MSG:
@@ -63,7 +63,7 @@ class Hyperplane(object):
                 return False
             else:
                 diff = self.constant_term - p.constant_term
-                return MyDecimal(diff).is_near_zero()
+                return is_near_zero(diff)
         elif p.normal_vector.is_zero():
             return False
 
@@ -133,7 +133,7 @@ class Hyperplane(object):
     @staticmethod
     def first_nonzero_index(iterable):
         for k, item in enumerate(iterable):
-            if not MyDecimal(item).is_near_zero():
+            if not is_near_zero(item):
                 return k
         raise Exception(Hyperplane.NO_NONZERO_ELTS_FOUND_MSG)
 
@@ -0,0 +1,208 @@
+from decimal import Decimal, getcontext
+
+from vector import Vector, to_number, is_near_zero
+from linsys import LinearSystem, Parameterization
+
+getcontext().prec = 30
+
+
+class IncrementalLinearSystem(LinearSystem):
+    """
+        LinearSystem that keeps its reduced row echelon form up to date
+
+        besides the reduced rows it keeps the transform T with
+        reduced[i] = sum_k T[i][k] * equation k, so appending, removing or
+        replacing one equation (and so any single coefficient change)
+        costs O(m*(m+n)) instead of a full re-elimination
+    """
+
+    def __init__(self, planes):
+        LinearSystem.__init__(self, list(planes))
+        self.refresh()
+
+    def _augmented_row(self, plane):
+        # the reduced form is kept in Decimal whatever the backend of the
+        # equations; solutions are converted back to it
+        row = [to_number(x, Decimal) for x in plane.normal_vector.coordinates]
+        row.append(to_number(plane.constant_term, Decimal))
+        return row
+
+    def refresh(self):
+        """
+            recomputes the reduced form from the equations, e.g. to drop
+            the rounding error accumulated over many updates
+        """
+        num_equations = len(self.planes)
+        self.reduced = [self._augmented_row(p) for p in self.planes]
+        self.transform = [[Decimal(1) if i == k else Decimal(0) for k in range(num_equations)]
+                          for i in range(num_equations)]
+        self.pivots = [-1] * num_equations
+
+        for c in range(self.dimension):
+            candidates = [i for i in range(num_equations)
+                          if self.pivots[i] < 0 and not is_near_zero(self.reduced[i][c])]
+            if not candidates:
+                continue
+            r = max(candidates, key=lambda i: abs(self.reduced[i][c]))
+            self._make_pivot(r, c)
+
+    def _make_pivot(self, r, c):
+        beta = Decimal('1.0') / self.reduced[r][c]
+        pivot_row = self.reduced[r] = [beta * x for x in self.reduced[r]]
+        pivot_row[c] = Decimal(1)
+        pivot_transform = self.transform[r] = [beta * x for x in self.transform[r]]
+        self.pivots[r] = c
+
+        for i in range(len(self.reduced)):
+            alpha = self.reduced[i][c]
+            if i == r or not alpha:
+                continue
+            self._subtract(i, alpha, pivot_row, pivot_transform)
+            self.reduced[i][c] = Decimal(0)
+
+    def _subtract(self, i, alpha, row, transform_row):
+        self.reduced[i] = [x - alpha * y for x, y in zip(self.reduced[i], row)]
+        self.transform[i] = [x - alpha * y for x, y in zip(self.transform[i], transform_row)]
+
+    def insert_row(self, index, plane):
+        if plane.dimension != self.dimension:
+            raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
+
+        self._invalidate_caches()
+        self.planes.insert(index, plane)
+        for t in self.transform:
+            t.insert(index, Decimal(0))
+
+        row = self._augmented_row(plane)
+        transform_row = [Decimal(0)] * len(self.planes)
+        transform_row[index] = Decimal(1)
+
+        for i, c in enumerate(self.pivots):
+            alpha = row[c] if c >= 0 else 0
+            if alpha:
+                row = [x - alpha * y for x, y in zip(row, self.reduced[i])]
+                transform_row = [x - alpha * y for x, y in zip(transform_row, self.transform[i])]
+                row[c] = Decimal(0)
+
+        self.reduced.append(row)
+        self.transform.append(transform_row)
+        self.pivots.append(-1)
+
+        for c in range(self.dimension):
+            if not is_near_zero(row[c]):
+                self._make_pivot(len(self.reduced) - 1, c)
+                break
+
+    def append_row(self, plane):
+        self.insert_row(len(self.planes), plane)
+
+    def remove_row(self, index):
+        self._invalidate_caches()
+        num_equations = len(self.planes)
+        weight = [t[index] for t in self.transform]
+
+        # prefer a zero row that depends on the equation; otherwise the
+        # dependent pivot row with the rightmost pivot, so that removing it
+        # leaves the other leading entries in place
+        zero_rows = [i for i in range(num_equations)
+                     if self.pivots[i] < 0 and not is_near_zero(weight[i])]
+        if zero_rows:
+            s = max(zero_rows, key=lambda i: abs(weight[i]))
+        else:
+            s = max([i for i in range(num_equations) if not is_near_zero(weight[i])],
+                    key=lambda i: self.pivots[i])
+
+        for i in range(num_equations):
+            alpha = self.transform[i][index]
+            if i == s or not alpha:
+                continue
+            self._subtract(i, alpha / self.transform[s][index], self.reduced[s], self.transform[s])
+
+        del self.reduced[s]
+        del self.transform[s]
+        del self.pivots[s]
+        for t in self.transform:
+            del t[index]
+
+        return self.planes.pop(index)
+
+    def replace_row(self, index, plane):
+        self.remove_row(index)
+        self.insert_row(index, plane)
+
+    def update_coefficient(self, row, col, value):
+        p = self.planes[row]
+        coordinates = list(p.normal_vector.coordinates)
+        coordinates[col] = value
+        self.replace_row(row, p.__class__(normal_vector=Vector(coordinates, p.normal_vector.number),
+                                          constant_term=p.constant_term))
+
+    def swap_rows(self, row1, row2):
+        self._invalidate_caches()
+        self.planes[row1], self.planes[row2] = self.planes[row2], self.planes[row1]
+        for t in self.transform:
+            t[row1], t[row2] = t[row2], t[row1]
+
+    def copy(self):
+        return LinearSystem(list(self.planes))
+
+    def __setitem__(self, i, x):
+        try:
+            assert x.dimension == self.dimension
+            self.replace_row(i, x)
+
+        except AssertionError:
+            raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
+
+    def _ordered_reduced_rows(self):
+        pivot_rows = sorted([i for i, c in enumerate(self.pivots) if c >= 0],
+                            key=lambda i: self.pivots[i])
+        zero_rows = [i for i, c in enumerate(self.pivots) if c < 0]
+        return pivot_rows + zero_rows
+
+    def compute_rref(self, inplace=False):
+        row_class = self.planes[0].__class__
+        return LinearSystem([row_class(normal_vector=Vector(self.reduced[i][:-1], self.number),
+                                       constant_term=self.reduced[i][-1])
+                             for i in self._ordered_reduced_rows()])
+
+    def compute_solution(self, inplace=False):
+        num_variables = self.dimension
+
+        for i, c in enumerate(self.pivots):
+            if c < 0 and not is_near_zero(self.reduced[i][-1]):
+                return self.NO_SOLUTIONS_MSG
+
+        basepoint_coords = [0] * num_variables
+        for i, c in enumerate(self.pivots):
+            if c >= 0:
+                basepoint_coords[c] = self.reduced[i][-1]
+
+        pivot_columns = set(self.pivots)
+        direction_vectors = []
+        for free_var in range(num_variables):
+            if free_var in pivot_columns:
+                continue
+            vector_coords = [0] * num_variables
+            vector_coords[free_var] = 1
+            for i, c in enumerate(self.pivots):
+                if c >= 0:
+                    vector_coords[c] = -self.reduced[i][free_var]
+            direction_vectors.append(Vector(vector_coords, self.number))
+
+        return Parameterization(Vector(basepoint_coords, self.number), direction_vectors)
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from linsys import _check_systems, _same_solution
+
+    for number in NUMERIC_BACKENDS:
+        for kind, system in _check_systems(number):
+            expected = system.compute_solution()
+            incremental = IncrementalLinearSystem(system.planes)
+            if not _same_solution(incremental.compute_solution(), expected):
+                print('compute_solution {} {} failed'.format(number.__name__, kind))
+            incremental.append_row(incremental.remove_row(0))
+            if not _same_solution(incremental.compute_solution(), expected):
+                print('remove_row and append_row {} {} failed'.format(number.__name__, kind))
@@ -0,0 +1,235 @@
+from math import sqrt
+from decimal import getcontext
+
+from vector import Vector
+
+getcontext().prec = 30
+
+
+class IterativeSolver(object):
+    """
+        Jacobi, Gauss-Seidel, conjugate gradient and restarted GMRES for a
+        square LinearSystem or SparseLinearSystem, run in binary floats on
+        the nonzero coefficients only
+
+        every method takes a relative residual tolerance, an iteration cap,
+        an optional warm-start vector x0 and an optional
+        callback(iteration, residual_norm) called once per iteration
+    """
+
+    SYSTEM_MUST_BE_SQUARE_MSG = 'Iterative solvers need as many equations as variables'
+    ZERO_DIAGONAL_MSG = 'Zero on the diagonal'
+    NOT_POSITIVE_DEFINITE_MSG = 'Matrix is not symmetric positive definite'
+    DID_NOT_CONVERGE_MSG = 'Did not converge'
+
+    def __init__(self, system):
+        self.dimension = system.dimension
+        self.number = system.number
+
+        if hasattr(system, 'rows'):
+            rows = [sorted(row.items()) for row in system.rows]
+            constant_terms = system.constant_terms
+        else:
+            rows = [[(j, x) for j, x in enumerate(system._row_coefficients(i)) if x]
+                    for i in range(len(system))]
+            constant_terms = [system._constant_term(i) for i in range(len(system))]
+
+        if len(rows) != self.dimension:
+            raise Exception(self.SYSTEM_MUST_BE_SQUARE_MSG)
+
+        self.rows = [[(j, float(x)) for j, x in row] for row in rows]
+        self.constant_terms = [float(k) for k in constant_terms]
+        self.diagonal = [dict(row).get(i, 0.0) for i, row in enumerate(self.rows)]
+
+    def apply(self, x):
+        return [sum([a*x[j] for j, a in row]) for row in self.rows]
+
+    def residual(self, x):
+        return [k - ax for k, ax in zip(self.constant_terms, self.apply(x))]
+
+    def _start(self, x0):
+        if x0 is None:
+            return [0.0] * self.dimension
+        return [float(x) for x in x0]
+
+    def _threshold(self, tolerance):
+        b_norm = norm(self.constant_terms)
+        if b_norm == 0:
+            return tolerance
+        return tolerance * b_norm
+
+    def _check_diagonal(self):
+        for d in self.diagonal:
+            if d == 0:
+                raise Exception(self.ZERO_DIAGONAL_MSG)
+
+    def jacobi(self, tolerance=1e-10, max_iterations=1000, x0=None, callback=None):
+        self._check_diagonal()
+        x = self._start(x0)
+        threshold = self._threshold(tolerance)
+
+        r = self.residual(x)
+        for iteration in range(1, max_iterations+1):
+            x = [xi + ri/d for xi, ri, d in zip(x, r, self.diagonal)]
+            r = self.residual(x)
+            r_norm = norm(r)
+            if callback is not None:
+                callback(iteration, r_norm)
+            if r_norm <= threshold:
+                return Vector(x, self.number)
+
+        raise Exception(self.DID_NOT_CONVERGE_MSG)
+
+    def gauss_seidel(self, tolerance=1e-10, max_iterations=1000, x0=None, callback=None):
+        self._check_diagonal()
+        x = self._start(x0)
+        threshold = self._threshold(tolerance)
+
+        for iteration in range(1, max_iterations+1):
+            for i, row in enumerate(self.rows):
+                total = self.constant_terms[i]
+                for j, a in row:
+                    if j != i:
+                        total -= a*x[j]
+                x[i] = total / self.diagonal[i]
+
+            r_norm = norm(self.residual(x))
+            if callback is not None:
+                callback(iteration, r_norm)
+            if r_norm <= threshold:
+                return Vector(x, self.number)
+
+        raise Exception(self.DID_NOT_CONVERGE_MSG)
+
+    def conjugate_gradient(self, tolerance=1e-10, max_iterations=None, x0=None, callback=None):
+        if max_iterations is None:
+            max_iterations = 10 * self.dimension
+        x = self._start(x0)
+        threshold = self._threshold(tolerance)
+
+        r = self.residual(x)
+        p = list(r)
+        rr = dot(r, r)
+        if sqrt(rr) <= threshold:
+            return Vector(x, self.number)
+
+        for iteration in range(1, max_iterations+1):
+            ap = self.apply(p)
+            pap = dot(p, ap)
+            if pap <= 0:
+                raise Exception(self.NOT_POSITIVE_DEFINITE_MSG)
+
+            alpha = rr / pap
+            x = [xi + alpha*pi for xi, pi in zip(x, p)]
+            r = [ri - alpha*api for ri, api in zip(r, ap)]
+            rr_new = dot(r, r)
+
+            if callback is not None:
+                callback(iteration, sqrt(rr_new))
+            if sqrt(rr_new) <= threshold:
+                return Vector(x, self.number)
+
+            beta = rr_new / rr
+            p = [ri + beta*pi for ri, pi in zip(r, p)]
+            rr = rr_new
+
+        raise Exception(self.DID_NOT_CONVERGE_MSG)
+
+    def gmres(self, tolerance=1e-10, max_iterations=None, x0=None, callback=None, restart=30):
+        if max_iterations is None:
+            max_iterations = 10 * self.dimension
+        x = self._start(x0)
+        threshold = self._threshold(tolerance)
+        restart = min(restart, self.dimension)
+        iteration = 0
+
+        while iteration < max_iterations:
+            r = self.residual(x)
+            beta = norm(r)
+            if beta <= threshold:
+                return Vector(x, self.number)
+
+            basis = [[ri/beta for ri in r]]
+            hessenberg = []
+            cosines = []
+            sines = []
+            g = [beta]
+
+            for k in range(restart):
+                iteration += 1
+
+                # Arnoldi step with modified Gram-Schmidt
+                w = self.apply(basis[k])
+                h = []
+                for v in basis:
+                    hv = dot(w, v)
+                    w = [wi - hv*vi for wi, vi in zip(w, v)]
+                    h.append(hv)
+                h_next = norm(w)
+                h.append(h_next)
+
+                # apply the previous Givens rotations, then a new one
+                for i in range(k):
+                    h[i], h[i+1] = (cosines[i]*h[i] + sines[i]*h[i+1],
+                                    -sines[i]*h[i] + cosines[i]*h[i+1])
+                radius = sqrt(h[k]**2 + h[k+1]**2)
+                if radius == 0:
+                    cosines.append(1.0)
+                    sines.append(0.0)
+                else:
+                    cosines.append(h[k]/radius)
+                    sines.append(h[k+1]/radius)
+                h[k] = radius
+                h[k+1] = 0.0
+                g.append(-sines[k]*g[k])
+                g[k] = cosines[k]*g[k]
+                hessenberg.append(h)
+
+                r_norm = abs(g[k+1])
+                if callback is not None:
+                    callback(iteration, r_norm)
+                if r_norm <= threshold or h_next == 0 or iteration >= max_iterations:
+                    break
+                basis.append([wi/h_next for wi in w])
+
+            # solve the small triangular system and update x
+            size = len(hessenberg)
+            y = [0.0] * size
+            for i in range(size)[::-1]:
+                total = g[i] - sum([hessenberg[j][i]*y[j] for j in range(i+1, size)])
+                y[i] = total / hessenberg[i][i]
+            for j in range(size):
+                x = [xi + y[j]*vi for xi, vi in zip(x, basis[j])]
+
+            if norm(self.residual(x)) <= threshold:
+                return Vector(x, self.number)
+
+        raise Exception(self.DID_NOT_CONVERGE_MSG)
+
+
+def dot(u, v):
+    return sum([a*b for a, b in zip(u, v)])
+
+
+def norm(v):
+    return sqrt(dot(v, v))
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from linsys import LinearSystem, _check_systems
+
+    # iterative methods find one point of the solution set, and cannot
+    # converge when there is none
+    for number in NUMERIC_BACKENDS:
+        for kind, system in _check_systems(number):
+            expected = system.compute_solution()
+            try:
+                x = IterativeSolver(system).gmres()
+            except Exception as e:
+                if expected != LinearSystem.NO_SOLUTIONS_MSG or str(e) != IterativeSolver.DID_NOT_CONVERGE_MSG:
+                    print('gmres {} {} failed'.format(number.__name__, kind))
+                continue
+            if (expected == LinearSystem.NO_SOLUTIONS_MSG or
+                    not all(expected.contains([x], tolerance='1e-8'))):
+                print('gmres {} {} failed'.format(number.__name__, kind))
@@ -0,0 +1,124 @@
+from decimal import Decimal, getcontext
+
+from vector import Vector, to_number, square_root, is_near_zero
+from linsys import LinearSystem
+
+getcontext().prec = 30
+
+
+class StreamingLeastSquares(object):
+    """
+        least-squares fit of a stream of Hyperplane-style rows, kept as the
+        triangular factor R and Q^T*b of a QR factorization updated with
+        Givens rotations, so memory stays O(n^2) however many rows are
+        added
+    """
+
+    ALL_ROWS_MUST_BE_IN_SAME_DIM_MSG = 'All rows should live in the same dimension'
+
+    def __init__(self, dimension, number=Decimal):
+        self.dimension = dimension
+        self.number = number
+        self.num_rows = 0
+
+        zero = number(0)
+        self.R = [[zero] * dimension for k in range(dimension)]
+        self.z = [zero] * dimension
+        self.residual_sum_of_squares = zero
+
+    def add_row(self, coefficients, constant_term):
+        if len(coefficients) != self.dimension:
+            raise Exception(self.ALL_ROWS_MUST_BE_IN_SAME_DIM_MSG)
+
+        number = self.number
+        a = [to_number(x, number) for x in coefficients]
+        beta = to_number(constant_term, number)
+        R = self.R
+        z = self.z
+        self.num_rows += 1
+
+        for k in range(self.dimension):
+            if not a[k]:
+                continue
+
+            row = R[k]
+            if not row[k]:
+                # first row reaching this position becomes row k of R
+                R[k] = a
+                z[k] = beta
+                return
+
+            radius = square_root(row[k]*row[k] + a[k]*a[k])
+            c = row[k] / radius
+            s = a[k] / radius
+            for j in range(k, self.dimension):
+                row[j], a[j] = c*row[j] + s*a[j], c*a[j] - s*row[j]
+            z[k], beta = c*z[k] + s*beta, c*beta - s*z[k]
+            a[k] = number(0)
+
+        self.residual_sum_of_squares += beta*beta
+
+    def add(self, plane):
+        self.add_row(plane.normal_vector.coordinates, plane.constant_term)
+
+    def add_all(self, planes):
+        for plane in planes:
+            self.add(plane)
+
+    def residual_norm(self):
+        return square_root(self.residual_sum_of_squares)
+
+    def compute_solution(self):
+        """
+            returns (best-fit Vector, residual norm); raises the
+            LinearSystem infinitely-many-solutions message when the rows
+            seen so far do not determine every variable
+        """
+        n = self.dimension
+        R = self.R
+        x = [self.number(0)] * n
+
+        for k in range(n)[::-1]:
+            if is_near_zero(R[k][k]):
+                raise Exception(LinearSystem.INF_SOLUTIONS_MSG)
+            total = self.z[k] - sum([R[k][j]*x[j] for j in range(k+1, n)])
+            x[k] = total / R[k][k]
+
+        return Vector(x, self.number), self.residual_norm()
+
+
+def solve_least_squares(planes, number=Decimal):
+    """
+        least-squares solution of any iterable of rows, consumed once
+    """
+    solver = None
+    for plane in planes:
+        if solver is None:
+            solver = StreamingLeastSquares(plane.dimension, number)
+        solver.add(plane)
+
+    if solver is None:
+        raise Exception(LinearSystem.INF_SOLUTIONS_MSG)
+
+    return solver.compute_solution()
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from linsys import Parameterization, _check_systems, _same_solution
+
+    # a consistent full-rank system is fitted exactly; otherwise the rows do
+    # not determine every variable
+    for number in NUMERIC_BACKENDS:
+        for kind, system in _check_systems(number):
+            expected = system.compute_solution()
+            try:
+                x, residual_norm = solve_least_squares(system.planes)
+            except Exception as e:
+                if (system.solution_kind() == LinearSystem.UNIQUE_SOLUTION_MSG or
+                        str(e) != LinearSystem.INF_SOLUTIONS_MSG):
+                    print('solve_least_squares {} {} failed'.format(number.__name__, kind))
+                continue
+            if not (_same_solution(Parameterization(x, []), expected) and
+                    is_near_zero(residual_norm)):
+                print('solve_least_squares {} {} failed'.format(number.__name__, kind))
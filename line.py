@@ -1,6 +1,6 @@
 from decimal import Decimal, getcontext
 
-from vector import Vector
+from vector import Vector, to_number, is_near_zero
 
 getcontext().prec = 30
 
@@ -18,8 +18,8 @@ class Line(object):
         self.normal_vector = normal_vector
 
         if not constant_term:
-            constant_term = Decimal('0')
-        self.constant_term = Decimal(constant_term)
+            constant_term = '0'
+        self.constant_term = to_number(constant_term, normal_vector.number)
 
         self.set_basepoint()
 
@@ -34,7 +34,7 @@ class Line(object):
             initial_coefficient = list(n.coordinates)[initial_index]
 
             basepoint_coords[initial_index] = c/initial_coefficient
-            self.basepoint = Vector(basepoint_coords)
+            self.basepoint = Vector(basepoint_coords, n.number)
 
         except Exception as e:
             if str(e) == Line.NO_NONZERO_ELTS_FOUND_MSG:
@@ -57,7 +57,7 @@ class Line(object):
                 return False
             else:
                 diff = self.constant_term - ell.constant_term
-                return MyDecimal(diff).is_near_zero()
+                return is_near_zero(diff)
         elif ell.normal_vector.is_zero():
             return False
 
@@ -81,9 +81,9 @@ class Line(object):
 
             x_numerator = D*k1 - B*k2
             y_numerator = -C*k1 + A*k2
-            one_over_denom =Decimal('1')/(A*D - B*C)
+            one_over_denom = 1/(A*D - B*C)
 
-            return Vector([x_numerator, y_numerator]).times_scalar(one_over_denom)
+            return Vector([x_numerator, y_numerator], self.normal_vector.number).times_scalar(one_over_denom)
 
         except ZeroDivisionError:
             if self == ell:
@@ -157,7 +157,7 @@ class Line(object):
     def first_nonzero_index(v):
         iterable = list(v.coordinates)
         for k, item in enumerate(iterable):
-            if not MyDecimal(item).is_near_zero():
+            if not is_near_zero(item):
                 return k
         raise Exception(Line.NO_NONZERO_ELTS_FOUND_MSG)
 
@@ -167,98 +167,43 @@ class MyDecimal(Decimal):
         return abs(self) < eps
 
 
-line1 = Line(normal_vector=Vector(['4.046', '2.836']), constant_term='1.21')
-
-line2 = Line(normal_vector = Vector(['10.115', '7.09']), constant_term = '3.025')
-
-print "interection 1: ",  line1.intersection_with(line2)
-
-line1 = Line(normal_vector = Vector(['7.204', '3.182']), constant_term = '8.68')
-line2 = Line(normal_vector = Vector(['8.172', '4.114']), constant_term = '9.883')
-
-print "interection 2: ",  line1.intersection_with(line2)
-
-line1 = Line(normal_vector = Vector(['1.182', '5.562']), constant_term = '6.744')
-line2 = Line(normal_vector = Vector(['1.773', '8.343']), constant_term = '9.525')
-
-print "interection 3: ",  line1.intersection_with(line2)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+if __name__ == '__main__':
 
+    line1 = Line(normal_vector=Vector(['4.046', '2.836']), constant_term='1.21')
+    line2 = Line(normal_vector=Vector(['10.115', '7.09']), constant_term='3.025')
 
+    print('interection 1: {}'.format(line1.intersection_with(line2)))
 
+    line1 = Line(normal_vector=Vector(['7.204', '3.182']), constant_term='8.68')
+    line2 = Line(normal_vector=Vector(['8.172', '4.114']), constant_term='9.883')
 
+    print('interection 2: {}'.format(line1.intersection_with(line2)))
 
+    line1 = Line(normal_vector=Vector(['1.182', '5.562']), constant_term='6.744')
+    line2 = Line(normal_vector=Vector(['1.773', '8.343']), constant_term='9.525')
 
+    print('interection 3: {}'.format(line1.intersection_with(line2)))
 
+    from vector import NUMERIC_BACKENDS
 
+    for number in NUMERIC_BACKENDS:
+        def line(coefficients, constant_term):
+            return Line(normal_vector=Vector(coefficients, number), constant_term=constant_term)
 
+        crossing = line(['1', '1'], '2'), line(['1', '-1'], '0')
+        parallel = line(['1', '2'], '3'), line(['2', '4'], '5')
+        coincident = line(['1', '2'], '3'), line(['2', '4'], '6')
 
+        point = crossing[0].intersection_with(crossing[1])
+        if not (point.number is number and
+                all([is_near_zero(x - 1) for x in point.coordinates])):
+            print('intersection_with {} crossing failed'.format(number.__name__))
+        if parallel[0].intersection_with(parallel[1]) is not None:
+            print('intersection_with {} parallel failed'.format(number.__name__))
+        if coincident[0].intersection_with(coincident[1]) is not coincident[0]:
+            print('intersection_with {} coincident failed'.format(number.__name__))
 
+        if crossing[0].is_parallel_to(crossing[1]):
+            print('is_parallel_to {} crossing failed'.format(number.__name__))
+        if not (parallel[0].is_parallel_to(parallel[1]) and coincident[0].is_parallel_to(coincident[1])):
+            print('is_parallel_to {} parallel failed'.format(number.__name__))
@@ -1,8 +1,7 @@
-from decimal import Decimal, getcontext
-from copy import deepcopy
+from decimal import Context, Decimal, getcontext
+from copy import copy
 
-from vector import Vector
-from plane import Plane
+from vector import Vector, to_number, square_root, is_near_zero
 from hyperplane import Hyperplane
 
 getcontext().prec = 30
@@ -13,6 +12,22 @@ class LinearSystem(object):
     ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG = 'All planes in the system should live in the same dimension'
     NO_SOLUTIONS_MSG = 'No solutions'
     INF_SOLUTIONS_MSG = 'Infinitely many solutions'
+    UNIQUE_SOLUTION_MSG = 'Unique solution'
+    SYSTEM_MUST_BE_SQUARE_MSG = 'Determinant is only defined for square systems'
+    VECTOR_MUST_MATCH_DIMENSION_MSG = 'The vector needs one coordinate per variable of the system'
+
+    # pivot column of each row, recorded by compute_triangular_form and
+    # compute_rref and dropped whenever a row changes
+    _pivot_indices = None
+
+    # (rank, determinant, is_consistent) from forward elimination, kept for
+    # the query methods until a row changes
+    _elimination_summary = None
+
+    # a cache.SolutionCache consulted by compute_solution and compute_rref
+    # when they do not work in place; None disables caching
+    solution_cache = None
+    _fingerprints = None
 
     def __init__(self, planes):
         try:
@@ -22,6 +37,7 @@ class LinearSystem(object):
 
             self.planes = planes
             self.dimension = d
+            self.number = planes[0].normal_vector.number
 
         except AssertionError:
             raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
@@ -38,8 +54,8 @@ class LinearSystem(object):
         new_normal_vector = n.times_scalar(coefficient)
         new_constant_term = k * coefficient
 
-        self[row] = Plane(normal_vector=new_normal_vector,
-                          constant_term=new_constant_term)
+        self[row] = self[row].__class__(normal_vector=new_normal_vector,
+                                        constant_term=new_constant_term)
 
     def add_multiple_times_row_to_row(self, coefficient, row_to_add, row_to_be_added_to):
         # add your code here
@@ -53,32 +69,194 @@ class LinearSystem(object):
         # new constant term
         new_constant_term = (k1 * coefficient) + k2
 
-        self[row_to_be_added_to] = Plane(normal_vector=new_normal_vector,
-                                         constant_term=new_constant_term)
+        self[row_to_be_added_to] = self[row_to_be_added_to].__class__(
+            normal_vector=new_normal_vector, constant_term=new_constant_term)
 
-    def indices_of_first_nonzero_terms_in_each_row(self):
-        num_equations = len(self)
-        num_variables = self.dimension
+    """
+        raw access to the augmented matrix, overridden by DenseLinearSystem
+    """
+    def _coefficient(self, row, col):
+        return self.planes[row].normal_vector.coordinates[col]
 
-        indices = [-1] * num_equations
+    def _constant_term(self, row):
+        return self.planes[row].constant_term
 
-        for i, p in enumerate(self.planes):
-            try:
-                indices[i] = p.first_nonzero_index(p.normal_vector)
-            except Exception as e:
-                if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
-                    continue
-                else:
-                    raise e
+    def _row_coefficients(self, row):
+        return self.planes[row].normal_vector.coordinates
+
+    def copy(self):
+        # rows are replaced, never mutated, by the row operations, so the
+        # copy can share them until a row operation rewrites one
+        system = copy(self)
+        system.planes = list(self.planes)
+        return system
+
+    def _nonzero_rows(self):
+        return [[(j, a) for j, a in enumerate(self._row_coefficients(i)) if a]
+                for i in range(len(self))]
+
+    def apply_many(self, X):
+        """
+            A*x for each candidate x (a Vector or a sequence of numbers),
+            reading the nonzero coefficients once for the whole batch
+        """
+        rows = self._nonzero_rows()
+        results = []
+        for x in X:
+            x = [to_number(v, self.number) for v in getattr(x, 'coordinates', x)]
+            if len(x) != self.dimension:
+                raise Exception(self.VECTOR_MUST_MATCH_DIMENSION_MSG)
+            results.append(Vector([sum([a*x[j] for j, a in row]) for row in rows], self.number))
+        return results
+
+    def apply(self, x):
+        return self.apply_many([x])[0]
+
+    def residuals(self, X):
+        """
+            b - A*x for each candidate x
+        """
+        constant_terms = [self._constant_term(i) for i in range(len(self))]
+        return [Vector([k - y for k, y in zip(constant_terms, Ax.coordinates)], self.number)
+                for Ax in self.apply_many(X)]
+
+    def residual(self, x):
+        return self.residuals([x])[0]
+
+    def to_dense(self):
+        return DenseLinearSystem(self.planes)
+
+    def fingerprint(self, kind='solution'):
+        from cache import fingerprint
+        key = (kind, getcontext().prec)
+        if self._fingerprints is None:
+            self._fingerprints = {}
+        if key not in self._fingerprints:
+            self._fingerprints[key] = fingerprint(self, kind)
+        return self._fingerprints[key]
+
+    def to_sparse(self):
+        from sparse import SparseLinearSystem
+        return SparseLinearSystem.from_linear_system(self)
+
+    def factorize(self):
+        from lu import LUFactorization
+        return LUFactorization(self)
+
+    def compute_mixed_precision_solution(self, max_refinements=10):
+        from lu import mixed_precision_solve
+        return mixed_precision_solve(self, max_refinements)
+
+    def compute_solution_by_blocks(self, processes=None):
+        from blocks import solve_blocks
+        return solve_blocks(self, processes)
+
+    def compute_solution_in_parallel(self, processes=None, block_size=64):
+        from parallel import solve_in_parallel
+        return solve_in_parallel(self, processes, block_size)
+
+    def compute_solution_out_of_core(self, path=None, rows_per_block=64):
+        from outofcore import solve_out_of_core
+        return solve_out_of_core(self, path, rows_per_block)
+
+    def compute_distributed_solution(self, processes=2, block_size=4):
+        from distributed import solve_distributed
+        return solve_distributed(self, processes, block_size)
+
+    def estimate_condition_number(self):
+        from condition import estimate_condition_number
+        return estimate_condition_number(self)
+
+    def compute_solution_with_digits(self, digits=10):
+        from condition import solve_with_digits
+        return solve_with_digits(self, digits)
+
+    def compute_solution_by_structure(self, max_bandwidth=None):
+        from structured import solve_structured
+        return solve_structured(self, max_bandwidth)
+
+    def record_elimination_plan(self):
+        from plan import EliminationPlan
+        return EliminationPlan(self)
+
+    def compute_least_squares_solution(self):
+        from leastsq import StreamingLeastSquares
+        solver = StreamingLeastSquares(self.dimension)
+        for i in range(len(self)):
+            solver.add_row(self._row_coefficients(i), self._constant_term(i))
+        x, residual_norm = solver.compute_solution()
+        return Vector(x.coordinates, self.number), residual_norm
+
+    def compute_sketched_least_squares_solution(self, sketch_size=None, kind='sparse sign', seed=0, refinement_steps=0):
+        from sketch import SketchSolver
+        solver = SketchSolver(self, sketch_size=sketch_size, kind=kind, seed=seed)
+        return solver.compute_solution(refinement_steps=refinement_steps)
+
+    def to_exact(self):
+        from exact import ExactLinearSystem
+        return ExactLinearSystem(self)
+
+    def compute_exact_solution(self, number=None):
+        return self.to_exact().compute_solution(number)
+
+    def _invalidate_caches(self):
+        self._pivot_indices = None
+        self._elimination_summary = None
+        self._fingerprints = None
+
+    def _summarize_elimination(self):
+        if self._elimination_summary is not None:
+            return self._elimination_summary
+
+        rows = [list(self._row_coefficients(i)) + [self._constant_term(i)]
+                for i in range(len(self))]
+        pivot_columns, determinant, is_consistent = _forward_eliminate(rows, self.dimension)
+        rank = len(pivot_columns)
+        if rank < self.dimension:
+            determinant = 0
+        determinant = to_number(determinant, self.number)
+
+        self._elimination_summary = (rank, determinant, is_consistent)
+        return self._elimination_summary
+
+    def rank(self):
+        return self._summarize_elimination()[0]
+
+    def determinant(self):
+        if len(self) != self.dimension:
+            raise Exception(self.SYSTEM_MUST_BE_SQUARE_MSG)
+
+        return self._summarize_elimination()[1]
+
+    def is_consistent(self):
+        return self._summarize_elimination()[2]
+
+    def solution_kind(self):
+        rank, determinant, is_consistent = self._summarize_elimination()
+
+        if not is_consistent:
+            return self.NO_SOLUTIONS_MSG
+        if rank < self.dimension:
+            return self.INF_SOLUTIONS_MSG
+        return self.UNIQUE_SOLUTION_MSG
+
+    def _first_nonzero_index(self, row):
+        for k, item in enumerate(self._row_coefficients(row)):
+            if not is_near_zero(item):
+                return k
+        return -1
+
+    def indices_of_first_nonzero_terms_in_each_row(self):
+        if self._pivot_indices is not None:
+            return list(self._pivot_indices)
 
-        return indices
+        return [self._first_nonzero_index(i) for i in range(len(self))]
 
     def swap_with_rwo_below_for_nonzero_coefficient_if_able(self, row, col):
         num_equations = len(self)
 
         for k in range(row+1, num_equations):
-            coeffcient = MyDecimal(self[k].normal_vector[col])
-            if not coeffcient.is_near_zero():
+            if not is_near_zero(self._coefficient(k, col)):
                 self.swap_rows(row, k)
                 return True
 
@@ -86,27 +264,33 @@ class LinearSystem(object):
 
     def clear_coefficients_above(self, row, col):
         for k in range(row)[::-1]:
-            n = self[k].normal_vector
-            alpha = -(n[col])
+            alpha = -(self._coefficient(k, col))
             self.add_multiple_times_row_to_row(alpha, row, k)
 
     def clear_coefficients_below(self, row, col):
         num_equations = len(self)
-        beta = MyDecimal(self[row].normal_vector[col])
+        beta = self._coefficient(row, col)
 
         for k in range(row+1, num_equations):
-            n = self[k].normal_vector
-            gamma = n[col]
+            gamma = self._coefficient(k, col)
             alpha = -gamma/beta
             self.add_multiple_times_row_to_row(alpha, row, k)
 
     def scale_row_to_make_coefficient_equal_one(self, row, col):
-        n = self[row].normal_vector
-        beta = Decimal('1.0')/n[col]
+        beta = 1/self._coefficient(row, col)
         self.multiply_coefficient_and_row(beta, row)
 
-    def compute_rref(self):
-        tf = self.compute_triangular_form()
+    def compute_rref(self, inplace=False):
+        if self.solution_cache is not None and not inplace:
+            rref = self.solution_cache.get_or_compute(
+                self.fingerprint('rref'), lambda: self._compute_rref(inplace=False))
+            # callers may run row operations on the result
+            return rref.copy()
+
+        return self._compute_rref(inplace=inplace)
+
+    def _compute_rref(self, inplace=False):
+        tf = self.compute_triangular_form(inplace=inplace)
 
         num_equations = len(tf)
         pivot_indices = tf.indices_of_first_nonzero_terms_in_each_row()
@@ -118,19 +302,25 @@ class LinearSystem(object):
             tf.scale_row_to_make_coefficient_equal_one(i, j)
             tf.clear_coefficients_above(i, j)
 
+        # scaling and clearing above keep every leading entry in place
+        tf._pivot_indices = pivot_indices
+
         return tf
 
-    def compute_triangular_form(self):
-        system = deepcopy(self)
+    def compute_triangular_form(self, inplace=False):
+        if inplace:
+            system = self
+        else:
+            system = self.copy()
 
         num_equations = len(system)
         num_variables = system.dimension
+        pivot_indices = [-1] * num_equations
 
         j = 0
         for i in range(num_equations):
             while j < num_variables:
-                c = MyDecimal(system[i].normal_vector[j])
-                if c.is_near_zero():
+                if is_near_zero(system._coefficient(i, j)):
                     swap_succeeded = system.swap_with_rwo_below_for_nonzero_coefficient_if_able(
                         i, j)
                     if not swap_succeeded:
@@ -138,9 +328,12 @@ class LinearSystem(object):
                         continue
 
                 system.clear_coefficients_below(i, j)
+                pivot_indices[i] = j
                 j += 1
                 break
 
+        system._pivot_indices = pivot_indices
+
         return system
 
     def raise_exception_if_too_few_pivots(self):
@@ -152,17 +345,12 @@ class LinearSystem(object):
             raise Exception(self.INF_SOLUTIONS_MSG)
 
     def raise_exception_if_contradictory_equation(self):
-        for p in self.planes:
-            try:
-                p.first_nonzero_index(p.normal_vector)
-
-            except Exception as e:
-                if str(e) == 'No nonzero elements found':
-                    constant_term = MyDecimal(p.constant_term)
-                    if not constant_term.is_near_zero():
-                        raise Exception(self.NO_SOLUTIONS_MSG)
-                else:
-                    raise e
+        pivot_indices = self.indices_of_first_nonzero_terms_in_each_row()
+
+        for i, index in enumerate(pivot_indices):
+            if index < 0:
+                if not is_near_zero(self._constant_term(i)):
+                    raise Exception(self.NO_SOLUTIONS_MSG)
 
     def do_gaussian_elimination_and_extract_solution(self):
         rref = self.compute_rref()
@@ -171,14 +359,15 @@ class LinearSystem(object):
         rref.raise_exception_if_too_few_pivots()
 
         num_variables = rref.dimension
-        solution_coordinates = [rref.planes[i].constant_term for i in range(num_variables)]
+        solution_coordinates = [rref._constant_term(i) for i in range(num_variables)]
 
-        return Vector(solution_coordinates)
+        return Vector(solution_coordinates, rref.number)
 
-    def do_gaussian_elimination_and_parameterize_solution(self):
-        rref = self.compute_rref()
+    def do_gaussian_elimination_and_parameterize_solution(self, inplace=False):
+        # bypasses the cache so a solve stores only its solution
+        rref = self._compute_rref(inplace=inplace)
 
-        rref.raise_exception_if_contradictory_equation
+        rref.raise_exception_if_contradictory_equation()
 
         direction_vectors = rref.extract_direction_vectors_for_parameterization()
         basepoint = rref.extract_basepoint_for_parameterization()
@@ -189,19 +378,19 @@ class LinearSystem(object):
     def extract_direction_vectors_for_parameterization(self):
         num_variables = self.dimension
         pivot_indices = self.indices_of_first_nonzero_terms_in_each_row()
-        free_variable_indices = set(range(num_variables)) - set(pivot_indices)
+        free_variable_indices = sorted(set(range(num_variables)) - set(pivot_indices))
 
         direction_vectors = []
 
         for free_var in free_variable_indices:
             vector_coords = [0]*num_variables
             vector_coords[free_var] = 1
-            for i,p in enumerate(self.planes):
+            for i in range(len(self)):
                 pivot_var = pivot_indices[i]
                 if pivot_var < 0:
                     break
-                vector_coords[pivot_var] = -p.normal_vector[free_var]
-            direction_vectors.append(Vector(vector_coords))
+                vector_coords[pivot_var] = -self._coefficient(i, free_var)
+            direction_vectors.append(Vector(vector_coords, self.number))
 
         return direction_vectors
 
@@ -211,19 +400,36 @@ class LinearSystem(object):
 
         basepoint_coords = [0]* num_variables
 
-        for i,p in enumerate(self.planes):
+        for i in range(len(self)):
             pivot_var = pivot_indices[i]
             if pivot_var < 0:
                 break
-            basepoint_coords[pivot_var] = p.constant_term
+            basepoint_coords[pivot_var] = self._constant_term(i)
 
-        return Vector(basepoint_coords)
+        return Vector(basepoint_coords, self.number)
 
 
-    def compute_solution(self):
+    def presolve(self):
+        return PresolvedLinearSystem(self)
+
+    def compute_solution(self, inplace=False, presolve=False):
+        if presolve:
+            return self.presolve().compute_solution()
+
+        if self.solution_cache is not None and not inplace:
+            solution = self.solution_cache.get_or_compute(
+                self.fingerprint('solution'), self._compute_solution)
+            # callers may extend the direction vectors
+            if isinstance(solution, Parameterization):
+                return solution.copy()
+            return solution
+
+        return self._compute_solution(inplace=inplace)
+
+    def _compute_solution(self, inplace=False):
         try:
             # return self.do_gaussian_elimination_and_extract_solution()
-            return self.do_gaussian_elimination_and_parameterize_solution()
+            return self.do_gaussian_elimination_and_parameterize_solution(inplace=inplace)
 
         except Exception as e:
             # if(str(e) == self.NO_SOLUTIONS_MSG or
@@ -237,6 +443,12 @@ class LinearSystem(object):
     def __len__(self):
         return len(self.planes)
 
+    def __getstate__(self):
+        # a cache set on the instance stays behind when the system is pickled
+        state = dict(self.__dict__)
+        state.pop('solution_cache', None)
+        return state
+
     def __getitem__(self, i):
         return self.planes[i]
 
@@ -244,6 +456,7 @@ class LinearSystem(object):
         try:
             assert x.dimension == self.dimension
             self.planes[i] = x
+            self._invalidate_caches()
 
         except AssertionError:
             raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
@@ -256,6 +469,117 @@ class LinearSystem(object):
         return ret
 
 
+class DenseLinearSystem(LinearSystem):
+    """
+        LinearSystem backed by one flat buffer holding the augmented matrix
+        row by row; row operations update the buffer in place and plane
+        objects are only built when a row is requested
+    """
+
+    def __init__(self, planes):
+        try:
+            d = planes[0].dimension
+            for p in planes:
+                assert p.dimension == d
+
+            self.dimension = d
+            self.number = planes[0].normal_vector.number
+            self.row_type = planes[0].__class__
+            self.num_equations = len(planes)
+            self.width = d + 1
+
+            self.data = []
+            for p in planes:
+                self.data.extend(p.normal_vector.coordinates)
+                self.data.append(to_number(p.constant_term, self.number))
+
+        except AssertionError:
+            raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
+
+    def swap_rows(self, row1, row2):
+        if row1 == row2:
+            return
+        self._invalidate_caches()
+        w = self.width
+        s1 = row1 * w
+        s2 = row2 * w
+        data = self.data
+        data[s1:s1+w], data[s2:s2+w] = data[s2:s2+w], data[s1:s1+w]
+
+    def multiply_coefficient_and_row(self, coefficient, row):
+        coefficient = to_number(coefficient, self.number)
+        self._invalidate_caches()
+        data = self.data
+        w = self.width
+        start = row * w
+
+        data[start:start+w] = [coefficient*x for x in data[start:start+w]]
+
+    def add_multiple_times_row_to_row(self, coefficient, row_to_add, row_to_be_added_to):
+        if not coefficient:
+            return
+        coefficient = to_number(coefficient, self.number)
+        self._invalidate_caches()
+        data = self.data
+        w = self.width
+        source = row_to_add * w
+        target = row_to_be_added_to * w
+
+        data[target:target+w] = [coefficient*x + y for x, y in
+                                 zip(data[source:source+w], data[target:target+w])]
+
+    def _coefficient(self, row, col):
+        return self.data[row * self.width + col]
+
+    def _constant_term(self, row):
+        return self.data[row * self.width + self.dimension]
+
+    def _row_coefficients(self, row):
+        start = row * self.width
+        return self.data[start:start + self.dimension]
+
+    def copy(self):
+        system = copy(self)
+        system.data = list(self.data)
+        return system
+
+    def to_dense(self):
+        return self.copy()
+
+    @property
+    def planes(self):
+        return [self[i] for i in range(len(self))]
+
+    def __len__(self):
+        return self.num_equations
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.num_equations
+        if not 0 <= i < self.num_equations:
+            raise IndexError('row index out of range')
+
+        return self.row_type(normal_vector=Vector(self._row_coefficients(i), self.number),
+                             constant_term=self._constant_term(i))
+
+    def __setitem__(self, i, x):
+        try:
+            assert x.dimension == self.dimension
+            if i < 0:
+                i += self.num_equations
+            if not 0 <= i < self.num_equations:
+                raise IndexError('row index out of range')
+
+            self._invalidate_caches()
+            start = i * self.width
+            self.data[start:start + self.dimension] = [to_number(v, self.number)
+                                                        for v in x.normal_vector.coordinates]
+            self.data[start + self.dimension] = to_number(x.constant_term, self.number)
+
+        except AssertionError:
+            raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
+
+
 class MyDecimal(Decimal):
 
     def is_near_zero(self, eps=1e-10):
@@ -265,6 +589,8 @@ class Parameterization(object):
 
     BASEPT_AND_DIR_VECTOR_MUST_BE_IN_SAME_DIM_MSG = (
         'The basepoint and direction vectors should all live in the same dimension')
+    ONE_PARAMETER_PER_DIRECTION_MSG = 'Each row of parameters needs one value per direction vector'
+    POINT_MUST_BE_IN_SAME_DIM_MSG = 'Points should live in the same dimension as the basepoint'
 
     def __init__(self, basepoint, direction_vectors):
 
@@ -277,7 +603,331 @@ class Parameterization(object):
             for v in direction_vectors:
                 assert v.dimension == self.dimension
         except AssertionError:
-            raise Exception(BASEPT_AND_DIR_VECTOR_MUST_BE_IN_SAME_DIM_MSG)
+            raise Exception(self.BASEPT_AND_DIR_VECTOR_MUST_BE_IN_SAME_DIM_MSG)
+
+    # orthonormal basis of the direction vectors, built by orthonormal_basis
+    _orthonormal_basis = None
+
+    def copy(self):
+        return Parameterization(self.basepoint, list(self.direction_vectors))
+
+    def evaluate(self, T):
+        """
+            the point basepoint + sum(t_k * direction_k) for each row of
+            parameter values in T
+        """
+        number = self.basepoint.number
+        basepoint = self.basepoint.coordinates
+        directions = [v.coordinates for v in self.direction_vectors]
+
+        points = []
+        for t in T:
+            t = list(t)
+            if len(t) != len(directions):
+                raise Exception(self.ONE_PARAMETER_PER_DIRECTION_MSG)
+            coordinates = list(basepoint)
+            for t_k, direction in zip(t, directions):
+                if t_k:
+                    t_k = to_number(t_k, number)
+                    coordinates = [x + t_k*d for x, d in zip(coordinates, direction)]
+            points.append(Vector(coordinates, number))
+        return points
+
+    def sample(self, num_points, scale=1, seed=0):
+        """
+            yields num_points points with parameters drawn uniformly from
+            [-scale, scale], one at a time
+        """
+        import random
+        rng = random.Random(seed)
+        num_parameters = len(self.direction_vectors)
+
+        for k in range(num_points):
+            t = [repr(rng.uniform(-scale, scale)) for j in range(num_parameters)]
+            yield self.evaluate([t])[0]
+
+    def orthonormal_basis(self):
+        if self._orthonormal_basis is None:
+            # modified Gram-Schmidt, dropping dependent directions
+            basis = []
+            for v in self.direction_vectors:
+                w = list(v.coordinates)
+                for q in basis:
+                    projection = sum([a*b for a, b in zip(w, q)])
+                    w = [a - projection*b for a, b in zip(w, q)]
+                norm = square_root(sum([a*a for a in w]))
+                if not is_near_zero(norm):
+                    basis.append([a / norm for a in w])
+            self._orthonormal_basis = basis
+
+        return self._orthonormal_basis
+
+    def project(self, points):
+        """
+            nearest point of the solution set to each point
+        """
+        number = self.basepoint.number
+        basepoint = self.basepoint.coordinates
+        basis = self.orthonormal_basis()
+
+        projections = []
+        for p in points:
+            p = getattr(p, 'coordinates', p)
+            if len(p) != self.dimension:
+                raise Exception(self.POINT_MUST_BE_IN_SAME_DIM_MSG)
+            offset = [to_number(x, number) - b for x, b in zip(p, basepoint)]
+            coordinates = list(basepoint)
+            for q in basis:
+                weight = sum([a*b for a, b in zip(offset, q)])
+                coordinates = [x + weight*b for x, b in zip(coordinates, q)]
+            projections.append(Vector(coordinates, number))
+        return projections
+
+    def contains(self, points, tolerance=Decimal('1e-10')):
+        """
+            whether each point lies within tolerance of the solution set
+        """
+        # project reads the points too, so one-shot iterables are kept
+        points = list(points)
+        number = self.basepoint.number
+        tolerance = to_number(tolerance, number)
+        result = []
+        for p, projection in zip(points, self.project(points)):
+            distance = square_root(sum([(to_number(x, number) - y)**2 for x, y in
+                                        zip(getattr(p, 'coordinates', p), projection.coordinates)]))
+            result.append(distance <= tolerance)
+        return result
+
+
+class PresolvedLinearSystem(object):
+    """
+        presolve pass run before elimination: drops zero rows, duplicate
+        and proportional rows (found by hashing each row scaled to a
+        leading coefficient of one) and substitutes single-variable rows
+        into the others, recording the fixed values and the surviving
+        variables so solutions map back to the original variables
+    """
+
+    CANONICAL_DIGITS = 20
+
+    def __init__(self, system):
+        # the reduction runs in Decimal; postsolve converts back to the
+        # system's backend
+        self.number = system.number
+        self.original_dimension = system.dimension
+        self.original_num_equations = len(system)
+        self.fixed_values = {}
+        self.is_contradictory = False
+
+        rows = []
+        for i in range(len(system)):
+            coefficients = dict([(j, to_number(x, Decimal))
+                                 for j, x in enumerate(system._row_coefficients(i))
+                                 if not is_near_zero(x)])
+            rows.append([coefficients, to_number(system._constant_term(i), Decimal)])
+
+        rows = self._substitute_singletons(rows)
+        if rows is not None:
+            rows = self._drop_duplicates(rows)
+
+        if rows is None:
+            self.is_contradictory = True
+            rows = []
+
+        self.kept_variables = [j for j in range(self.original_dimension) if j not in self.fixed_values]
+        self.num_equations = len(rows)
+
+        if rows and self.kept_variables:
+            self.system = LinearSystem([Hyperplane(normal_vector=Vector([coefficients.get(j, 0)
+                                                                          for j in self.kept_variables],
+                                                                         Decimal),
+                                                   constant_term=constant_term)
+                                        for coefficients, constant_term in rows])
+        else:
+            self.system = None
+
+    def _substitute_singletons(self, rows):
+        rows_with_variable = {}
+        for i, (coefficients, constant_term) in enumerate(rows):
+            for j in coefficients:
+                rows_with_variable.setdefault(j, set()).add(i)
+
+        alive = [True] * len(rows)
+        queue = [i for i, row in enumerate(rows) if len(row[0]) <= 1]
+
+        while queue:
+            i = queue.pop()
+            if not alive[i]:
+                continue
+            coefficients, constant_term = rows[i]
+
+            if not coefficients:
+                if not is_near_zero(constant_term):
+                    return None
+                alive[i] = False
+                continue
+            if len(coefficients) > 1:
+                continue
+
+            (j, a), = coefficients.items()
+            value = constant_term / a
+            self.fixed_values[j] = value
+            alive[i] = False
+
+            for k in rows_with_variable.pop(j, ()):
+                if not alive[k]:
+                    continue
+                row = rows[k]
+                row[1] = row[1] - row[0].pop(j) * value
+                if len(row[0]) <= 1:
+                    queue.append(k)
+
+        return [row for i, row in enumerate(rows) if alive[i]]
+
+    def _canonical_key(self, coefficients):
+        context = Context(prec=self.CANONICAL_DIGITS)
+        leading = coefficients[min(coefficients)]
+        return tuple([(j, context.create_decimal(coefficients[j] / leading).normalize(context))
+                      for j in sorted(coefficients)])
+
+    def _drop_duplicates(self, rows):
+        seen = {}
+        kept = []
+
+        for coefficients, constant_term in rows:
+            leading = coefficients[min(coefficients)]
+            key = self._canonical_key(coefficients)
+            scaled_constant = constant_term / leading
+
+            if key in seen:
+                other_coefficients, other_constant = seen[key]
+                other_leading = other_coefficients[min(other_coefficients)]
+                proportional = True
+                for j in coefficients:
+                    difference = coefficients[j] / leading - other_coefficients[j] / other_leading
+                    if not is_near_zero(difference):
+                        proportional = False
+                        break
+                if proportional:
+                    if not is_near_zero(scaled_constant - other_constant / other_leading):
+                        return None
+                    continue
+            else:
+                seen[key] = (coefficients, constant_term)
+
+            kept.append([coefficients, constant_term])
+
+        return kept
+
+    def postsolve(self, solution):
+        """
+            maps a solution of the reduced system back to the original
+            variables
+        """
+        if solution == LinearSystem.NO_SOLUTIONS_MSG:
+            return solution
+
+        num_variables = self.original_dimension
+
+        basepoint_coords = [0] * num_variables
+        for j, value in self.fixed_values.items():
+            basepoint_coords[j] = value
+
+        direction_vectors = []
+        if solution is None:
+            for j in self.kept_variables:
+                vector_coords = [0] * num_variables
+                vector_coords[j] = 1
+                direction_vectors.append(Vector(vector_coords, self.number))
+        else:
+            for j, x in zip(self.kept_variables, solution.basepoint.coordinates):
+                basepoint_coords[j] = x
+            for v in solution.direction_vectors:
+                vector_coords = [0] * num_variables
+                for j, x in zip(self.kept_variables, v.coordinates):
+                    vector_coords[j] = x
+                direction_vectors.append(Vector(vector_coords, self.number))
+
+        return Parameterization(Vector(basepoint_coords, self.number), direction_vectors)
+
+    def compute_solution(self):
+        if self.is_contradictory:
+            return LinearSystem.NO_SOLUTIONS_MSG
+        if self.system is None:
+            return self.postsolve(None)
+        return self.postsolve(self.system.compute_solution(inplace=True))
+
+
+def _forward_eliminate(rows, num_variables):
+    # forward elimination in place on bare augmented rows, with the same
+    # pivot choices, arithmetic and near-zero checks as
+    # LinearSystem.compute_triangular_form; returns the pivot column of
+    # each nonzero row, the product of the pivots with the sign of the row
+    # swaps, and whether the rows left over have zero constant terms
+    num_equations = len(rows)
+    pivot_columns = []
+    determinant = 1
+
+    j = 0
+    for i in range(num_equations):
+        while j < num_variables:
+            if is_near_zero(rows[i][j]):
+                for k in range(i+1, num_equations):
+                    if not is_near_zero(rows[k][j]):
+                        rows[i], rows[k] = rows[k], rows[i]
+                        determinant = -determinant
+                        break
+                else:
+                    j += 1
+                    continue
+
+            pivot_row = rows[i]
+            beta = pivot_row[j]
+            for k in range(i+1, num_equations):
+                gamma = rows[k][j]
+                if gamma:
+                    alpha = -gamma/beta
+                    rows[k] = [x + alpha*y for x, y in zip(rows[k], pivot_row)]
+
+            determinant *= beta
+            pivot_columns.append(j)
+            j += 1
+            break
+
+    is_consistent = all([is_near_zero(row[-1]) for row in rows[len(pivot_columns):]])
+    return pivot_columns, determinant, is_consistent
+
+
+def _check_systems(number):
+    # fresh systems with a unique solution, infinitely many and none, in
+    # one backend, for the inline checks of the solver modules
+    def system(rows):
+        return LinearSystem([Hyperplane(normal_vector=Vector(coefficients, number),
+                                        constant_term=constant_term)
+                             for coefficients, constant_term in rows])
+
+    return [('unique', system([(['0', '1', '1'], '1'),
+                               (['1', '-1', '1'], '2'),
+                               (['1', '2', '-5'], '3')])),
+            ('infinite', system([(['1', '1', '1'], '1'),
+                                 (['0', '1', '1'], '2'),
+                                 (['1', '2', '2'], '3')])),
+            ('none', system([(['1', '1', '1'], '1'),
+                             (['0', '1', '1'], '2'),
+                             (['1', '2', '2'], '4')]))]
+
+
+def _same_solution(solution, expected, tolerance=Decimal('1e-8')):
+    # whether two solver results describe the same solution set, whatever
+    # free variables and backends they were built with
+    if not hasattr(solution, 'basepoint') or not hasattr(expected, 'basepoint'):
+        return solution == expected
+    if len(solution.orthonormal_basis()) != len(expected.orthonormal_basis()):
+        return False
+
+    basepoint = solution.basepoint
+    points = [basepoint] + [basepoint.plus(v) for v in solution.direction_vectors]
+    return all(expected.contains(points, tolerance))
 
 
 
@@ -521,149 +1171,185 @@ class Parameterization(object):
 
 """
 
-p0 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
-p1 = Hyperplane(normal_vector=Vector(['0', '1', '0']), constant_term='2')
-p2 = Hyperplane(normal_vector=Vector(['1', '1', '-1']), constant_term='3')
-p3 = Hyperplane(normal_vector=Vector(['1', '0', '-2']), constant_term='2')
-
-s = LinearSystem([p0, p1, p2, p3])
-s.swap_rows(0, 1)
-
-if not (s[0] == p1 and s[1] == p0 and s[2] == p2 and s[3] == p3):
-    print 'test case 1 failed'
-
-s.swap_rows(1, 3)
-if not (s[0] == p1 and s[1] == p3 and s[2] == p2 and s[3] == p0):
-    print 'test case 2 failed'
-
-s.swap_rows(3, 1)
-if not (s[0] == p1 and s[1] == p0 and s[2] == p2 and s[3] == p3):
-    print 'test case 3 failed'
-
-s.multiply_coefficient_and_row(1, 0)
-if not (s[0] == p1 and s[1] == p0 and s[2] == p2 and s[3] == p3):
-    print 'test case 4 failed'
-
-s.multiply_coefficient_and_row(-1, 2)
-if not (s[0] == p1 and
-        s[1] == p0 and
-        s[2] == Hyperplane(normal_vector=Vector(['-1', '-1', '1']), constant_term='-3') and
-        s[3] == p3):
-    print 'test case 5 failed'
-
-s.multiply_coefficient_and_row(10, 1)
-if not (s[0] == p1 and
-        s[1] == Hyperplane(normal_vector=Vector(['10', '10', '10']), constant_term='10') and
-        s[2] == Hyperplane(normal_vector=Vector(['-1', '-1', '1']), constant_term='-3') and
-        s[3] == p3):
-    print 'test case 6 failed'
-
-s.add_multiple_times_row_to_row(0, 0, 1)
-if not (s[0] == p1 and
-        s[1] == Hyperplane(normal_vector=Vector(['10', '10', '10']), constant_term='10') and
-        s[2] == Hyperplane(normal_vector=Vector(['-1', '-1', '1']), constant_term='-3') and
-        s[3] == p3):
-    print 'test case 7 failed'
-
-s.add_multiple_times_row_to_row(1, 0, 1)
-if not (s[0] == p1 and
-        s[1] == Hyperplane(normal_vector=Vector(['10', '11', '10']), constant_term='12') and
-        s[2] == Hyperplane(normal_vector=Vector(['-1', '-1', '1']), constant_term='-3') and
-        s[3] == p3):
-    print 'test case 8 failed'
-
-s.add_multiple_times_row_to_row(-1, 1, 0)
-if not (s[0] == Hyperplane(normal_vector=Vector(['-10', '-10', '-10']), constant_term='-10') and
-        s[1] == Hyperplane(normal_vector=Vector(['10', '11', '10']), constant_term='12') and
-        s[2] == Hyperplane(normal_vector=Vector(['-1', '-1', '1']), constant_term='-3') and
-        s[3] == p3):
-    print 'test case 9 failed'
-
-
-p1 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
-p2 = Hyperplane(normal_vector=Vector(['0', '1', '1']), constant_term='2')
-s = LinearSystem([p1, p2])
-t = s.compute_triangular_form()
-if not (t[0] == p1 and
-        t[1] == p2):
-    print 'test case 1 failed'
-
-p1 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
-p2 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='2')
-s = LinearSystem([p1, p2])
-t = s.compute_triangular_form()
-if not (t[0] == p1 and
-        t[1] == Hyperplane(constant_term='1')):
-    print 'test case 2 failed'
-
-p1 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
-p2 = Hyperplane(normal_vector=Vector(['0', '1', '0']), constant_term='2')
-p3 = Hyperplane(normal_vector=Vector(['1', '1', '-1']), constant_term='3')
-p4 = Hyperplane(normal_vector=Vector(['1', '0', '-2']), constant_term='2')
-s = LinearSystem([p1, p2, p3, p4])
-t = s.compute_triangular_form()
-if not (t[0] == p1 and
-        t[1] == p2 and
-        t[2] == Hyperplane(normal_vector=Vector(['0', '0', '-2']), constant_term='2') and
-        t[3] == Hyperplane()):
-    print 'test case 3 failed'
-
-p1 = Hyperplane(normal_vector=Vector(['0', '1', '1']), constant_term='1')
-p2 = Hyperplane(normal_vector=Vector(['1', '-1', '1']), constant_term='2')
-p3 = Hyperplane(normal_vector=Vector(['1', '2', '-5']), constant_term='3')
-s = LinearSystem([p1, p2, p3])
-t = s.compute_triangular_form()
-if not (t[0] == Hyperplane(normal_vector=Vector(['1', '-1', '1']), constant_term='2') and
-        t[1] == Hyperplane(normal_vector=Vector(['0', '1', '1']), constant_term='1') and
-        t[2] == Hyperplane(normal_vector=Vector(['0', '0', '-9']), constant_term='-2')):
-    print 'test case 4 failed'
-
-
-p1 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
-p2 = Hyperplane(normal_vector=Vector(['0', '1', '1']), constant_term='2')
-s = LinearSystem([p1, p2])
-r = s.compute_rref()
-if not (r[0] == Hyperplane(normal_vector=Vector(['1', '0', '0']), constant_term='-1') and
-        r[1] == p2):
-    print 'test case 1 failed'
-
-p1 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
-p2 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='2')
-s = LinearSystem([p1, p2])
-r = s.compute_rref()
-if not (r[0] == p1 and
-        r[1] == Hyperplane(constant_term='1')):
-    print 'test case 2 failed'
-
-p1 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
-p2 = Hyperplane(normal_vector=Vector(['0', '1', '0']), constant_term='2')
-p3 = Hyperplane(normal_vector=Vector(['1', '1', '-1']), constant_term='3')
-p4 = Hyperplane(normal_vector=Vector(['1', '0', '-2']), constant_term='2')
-s = LinearSystem([p1, p2, p3, p4])
-r = s.compute_rref()
-if not (r[0] == Hyperplane(normal_vector=Vector(['1', '0', '0']), constant_term='0') and
-        r[1] == p2 and
-        r[2] == Hyperplane(normal_vector=Vector(['0', '0', '-2']), constant_term='2') and
-        r[3] == Hyperplane()):
-    print 'test case 3 failed'
-
-p1 = Hyperplane(normal_vector=Vector(['0', '1', '1']), constant_term='1')
-p2 = Hyperplane(normal_vector=Vector(['1', '-1', '1']), constant_term='2')
-p3 = Hyperplane(normal_vector=Vector(['1', '2', '-5']), constant_term='3')
-s = LinearSystem([p1, p2, p3])
-r = s.compute_rref()
-if not (r[0] == Hyperplane(normal_vector=Vector(['1', '0', '0']), constant_term=Decimal('23')/Decimal('9')) and
-        r[1] == Hyperplane(normal_vector=Vector(['0', '1', '0']), constant_term=Decimal('7')/Decimal('9')) and
-        r[2] == Hyperplane(normal_vector=Vector(['0', '0', '1']), constant_term=Decimal('2')/Decimal('9'))):
-    print 'test case 4 failed'
-
-
-
-
-
-
-
-
-
-
-
+if __name__ == '__main__':
+
+    p0 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+    p1 = Hyperplane(normal_vector=Vector(['0', '1', '0']), constant_term='2')
+    p2 = Hyperplane(normal_vector=Vector(['1', '1', '-1']), constant_term='3')
+    p3 = Hyperplane(normal_vector=Vector(['1', '0', '-2']), constant_term='2')
+
+    s = LinearSystem([p0, p1, p2, p3])
+    s.swap_rows(0, 1)
+
+    if not (s[0] == p1 and s[1] == p0 and s[2] == p2 and s[3] == p3):
+        print('test case 1 failed')
+
+    s.swap_rows(1, 3)
+    if not (s[0] == p1 and s[1] == p3 and s[2] == p2 and s[3] == p0):
+        print('test case 2 failed')
+
+    s.swap_rows(3, 1)
+    if not (s[0] == p1 and s[1] == p0 and s[2] == p2 and s[3] == p3):
+        print('test case 3 failed')
+
+    s.multiply_coefficient_and_row(1, 0)
+    if not (s[0] == p1 and s[1] == p0 and s[2] == p2 and s[3] == p3):
+        print('test case 4 failed')
+
+    s.multiply_coefficient_and_row(-1, 2)
+    if not (s[0] == p1 and
+            s[1] == p0 and
+            s[2] == Hyperplane(normal_vector=Vector(['-1', '-1', '1']), constant_term='-3') and
+            s[3] == p3):
+        print('test case 5 failed')
+
+    s.multiply_coefficient_and_row(10, 1)
+    if not (s[0] == p1 and
+            s[1] == Hyperplane(normal_vector=Vector(['10', '10', '10']), constant_term='10') and
+            s[2] == Hyperplane(normal_vector=Vector(['-1', '-1', '1']), constant_term='-3') and
+            s[3] == p3):
+        print('test case 6 failed')
+
+    s.add_multiple_times_row_to_row(0, 0, 1)
+    if not (s[0] == p1 and
+            s[1] == Hyperplane(normal_vector=Vector(['10', '10', '10']), constant_term='10') and
+            s[2] == Hyperplane(normal_vector=Vector(['-1', '-1', '1']), constant_term='-3') and
+            s[3] == p3):
+        print('test case 7 failed')
+
+    s.add_multiple_times_row_to_row(1, 0, 1)
+    if not (s[0] == p1 and
+            s[1] == Hyperplane(normal_vector=Vector(['10', '11', '10']), constant_term='12') and
+            s[2] == Hyperplane(normal_vector=Vector(['-1', '-1', '1']), constant_term='-3') and
+            s[3] == p3):
+        print('test case 8 failed')
+
+    s.add_multiple_times_row_to_row(-1, 1, 0)
+    if not (s[0] == Hyperplane(normal_vector=Vector(['-10', '-10', '-10']), constant_term='-10') and
+            s[1] == Hyperplane(normal_vector=Vector(['10', '11', '10']), constant_term='12') and
+            s[2] == Hyperplane(normal_vector=Vector(['-1', '-1', '1']), constant_term='-3') and
+            s[3] == p3):
+        print('test case 9 failed')
+
+
+    p1 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+    p2 = Hyperplane(normal_vector=Vector(['0', '1', '1']), constant_term='2')
+    s = LinearSystem([p1, p2])
+    t = s.compute_triangular_form()
+    if not (t[0] == p1 and
+            t[1] == p2):
+        print('test case 1 failed')
+
+    p1 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+    p2 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='2')
+    s = LinearSystem([p1, p2])
+    t = s.compute_triangular_form()
+    if not (t[0] == p1 and
+            t[1] == Hyperplane(dimension=3, constant_term='1')):
+        print('test case 2 failed')
+
+    p1 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+    p2 = Hyperplane(normal_vector=Vector(['0', '1', '0']), constant_term='2')
+    p3 = Hyperplane(normal_vector=Vector(['1', '1', '-1']), constant_term='3')
+    p4 = Hyperplane(normal_vector=Vector(['1', '0', '-2']), constant_term='2')
+    s = LinearSystem([p1, p2, p3, p4])
+    t = s.compute_triangular_form()
+    if not (t[0] == p1 and
+            t[1] == p2 and
+            t[2] == Hyperplane(normal_vector=Vector(['0', '0', '-2']), constant_term='2') and
+            t[3] == Hyperplane(dimension=3)):
+        print('test case 3 failed')
+
+    p1 = Hyperplane(normal_vector=Vector(['0', '1', '1']), constant_term='1')
+    p2 = Hyperplane(normal_vector=Vector(['1', '-1', '1']), constant_term='2')
+    p3 = Hyperplane(normal_vector=Vector(['1', '2', '-5']), constant_term='3')
+    s = LinearSystem([p1, p2, p3])
+    t = s.compute_triangular_form()
+    if not (t[0] == Hyperplane(normal_vector=Vector(['1', '-1', '1']), constant_term='2') and
+            t[1] == Hyperplane(normal_vector=Vector(['0', '1', '1']), constant_term='1') and
+            t[2] == Hyperplane(normal_vector=Vector(['0', '0', '-9']), constant_term='-2')):
+        print('test case 4 failed')
+
+
+    p1 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+    p2 = Hyperplane(normal_vector=Vector(['0', '1', '1']), constant_term='2')
+    s = LinearSystem([p1, p2])
+    r = s.compute_rref()
+    if not (r[0] == Hyperplane(normal_vector=Vector(['1', '0', '0']), constant_term='-1') and
+            r[1] == p2):
+        print('test case 1 failed')
+
+    p1 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+    p2 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='2')
+    s = LinearSystem([p1, p2])
+    r = s.compute_rref()
+    if not (r[0] == p1 and
+            r[1] == Hyperplane(dimension=3, constant_term='1')):
+        print('test case 2 failed')
+
+    p1 = Hyperplane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+    p2 = Hyperplane(normal_vector=Vector(['0', '1', '0']), constant_term='2')
+    p3 = Hyperplane(normal_vector=Vector(['1', '1', '-1']), constant_term='3')
+    p4 = Hyperplane(normal_vector=Vector(['1', '0', '-2']), constant_term='2')
+    s = LinearSystem([p1, p2, p3, p4])
+    r = s.compute_rref()
+    if not (r[0] == Hyperplane(normal_vector=Vector(['1', '0', '0']), constant_term='0') and
+            r[1] == p2 and
+            r[2] == Hyperplane(normal_vector=Vector(['0', '0', '-2']), constant_term='2') and
+            r[3] == Hyperplane(dimension=3)):
+        print('test case 3 failed')
+
+    p1 = Hyperplane(normal_vector=Vector(['0', '1', '1']), constant_term='1')
+    p2 = Hyperplane(normal_vector=Vector(['1', '-1', '1']), constant_term='2')
+    p3 = Hyperplane(normal_vector=Vector(['1', '2', '-5']), constant_term='3')
+    s = LinearSystem([p1, p2, p3])
+    r = s.compute_rref()
+    if not (r[0] == Hyperplane(normal_vector=Vector(['1', '0', '0']), constant_term=Decimal('23')/Decimal('9')) and
+            r[1] == Hyperplane(normal_vector=Vector(['0', '1', '0']), constant_term=Decimal('7')/Decimal('9')) and
+            r[2] == Hyperplane(normal_vector=Vector(['0', '0', '1']), constant_term=Decimal('2')/Decimal('9'))):
+        print('test case 4 failed')
+
+
+    from vector import NUMERIC_BACKENDS
+    from cache import SolutionCache
+
+    def cached_solution(s):
+        s.solution_cache = SolutionCache()
+        s.compute_solution()
+        return s.compute_solution()
+
+    entry_points = [
+        ('compute_solution(presolve=True)', lambda s: s.compute_solution(presolve=True)),
+        ('compute_solution with a solution_cache', cached_solution),
+        ('compute_mixed_precision_solution', lambda s: s.compute_mixed_precision_solution()),
+        ('compute_solution_by_blocks', lambda s: s.compute_solution_by_blocks(processes=1)),
+        ('compute_solution_in_parallel', lambda s: s.compute_solution_in_parallel(processes=1)),
+        ('compute_solution_out_of_core', lambda s: s.compute_solution_out_of_core()),
+        ('compute_distributed_solution', lambda s: s.compute_distributed_solution()[0]),
+        ('compute_solution_with_digits', lambda s: s.compute_solution_with_digits()[0]),
+        ('compute_solution_by_structure', lambda s: s.compute_solution_by_structure()[0]),
+        ('compute_exact_solution', lambda s: s.compute_exact_solution()),
+        ('record_elimination_plan', lambda s: s.record_elimination_plan().compute_solution(s)),
+        ('factorize', lambda s: s.factorize().solve([s._constant_term(i) for i in range(len(s))])),
+        ('to_sparse', lambda s: s.to_sparse().compute_solution()),
+    ]
+
+    for number in NUMERIC_BACKENDS:
+        for kind, s in _check_systems(number):
+            expected = s.compute_solution()
+            for name, solve in entry_points:
+                for system in (s.copy(), s.to_dense()):
+                    if not _same_solution(solve(system), expected):
+                        print('{} {} {} {} failed'.format(name, system.__class__.__name__,
+                                                          number.__name__, kind))
+
+        kind, s = _check_systems(number)[0]
+        expected = s.compute_solution()
+        x, residual_norm = s.compute_least_squares_solution()
+        if not _same_solution(Parameterization(x, []), expected):
+            print('compute_least_squares_solution {} failed'.format(number.__name__))
+        x, residual_norm = s.compute_sketched_least_squares_solution(kind='gaussian', refinement_steps=3)
+        if not _same_solution(Parameterization(x, []), expected):
+            print('compute_sketched_least_squares_solution {} failed'.format(number.__name__))
+        if not s.estimate_condition_number() < float('inf'):
+            print('estimate_condition_number {} failed'.format(number.__name__))
@@ -0,0 +1,216 @@
+from decimal import Decimal, getcontext
+
+from vector import Vector, to_number, is_near_zero
+from linsys import LinearSystem, Parameterization
+
+getcontext().prec = 30
+
+
+class LUFactorization(object):
+    """
+        P*A = L*U with partial pivoting for the coefficient matrix of a
+        LinearSystem; U is in row echelon form so rank-deficient and
+        non-square systems factor too
+    """
+
+    RHS_MUST_MATCH_NUM_EQUATIONS_MSG = 'The right-hand side must have one entry per equation'
+    TRANSPOSE_NEEDS_NONSINGULAR_MSG = 'Transposed solves need a square nonsingular system'
+
+    def __init__(self, system, number=Decimal):
+        # number is the arithmetic of the factors; solutions come back in
+        # the backend of the system
+        self.number = number
+        self.solution_number = system.number
+        self.num_equations = len(system)
+        self.dimension = system.dimension
+
+        num_equations = self.num_equations
+        num_variables = self.dimension
+
+        upper = [[to_number(x, number) for x in system._row_coefficients(i)]
+                 for i in range(num_equations)]
+        lower = [[] for i in range(num_equations)]
+        permutation = list(range(num_equations))
+        pivot_columns = []
+
+        r = 0
+        for c in range(num_variables):
+            if r == num_equations:
+                break
+
+            p = max(range(r, num_equations), key=lambda i: abs(upper[i][c]))
+            if is_near_zero(upper[p][c]):
+                continue
+
+            if p != r:
+                upper[r], upper[p] = upper[p], upper[r]
+                lower[r], lower[p] = lower[p], lower[r]
+                permutation[r], permutation[p] = permutation[p], permutation[r]
+
+            pivot_row = upper[r]
+            pivot = pivot_row[c]
+            for i in range(r+1, num_equations):
+                row = upper[i]
+                multiplier = row[c] / pivot
+                lower[i].append(multiplier)
+                if multiplier:
+                    for j in range(c+1, num_variables):
+                        row[j] -= multiplier * pivot_row[j]
+                row[c] = number(0)
+
+            pivot_columns.append(c)
+            r += 1
+
+        self.upper = upper
+        self.lower = lower
+        self.permutation = permutation
+        self.pivot_columns = pivot_columns
+        self.rank = len(pivot_columns)
+
+        self.direction_vectors = self._compute_direction_vectors()
+
+    def _compute_direction_vectors(self):
+        num_variables = self.dimension
+        free_variable_indices = sorted(set(range(num_variables)) - set(self.pivot_columns))
+        direction_vectors = []
+
+        for free_var in free_variable_indices:
+            x = [self.number(0)] * num_variables
+            x[free_var] = self.number(1)
+            self._back_substitute([self.number(0)] * self.rank, x)
+            direction_vectors.append(Vector(x, self.solution_number))
+
+        return direction_vectors
+
+    def _forward_substitute(self, b):
+        if len(b) != self.num_equations:
+            raise Exception(self.RHS_MUST_MATCH_NUM_EQUATIONS_MSG)
+
+        y = [to_number(b[k], self.number) for k in self.permutation]
+        for i in range(1, self.num_equations):
+            multipliers = self.lower[i]
+            if multipliers:
+                y[i] -= sum([l*y[k] for k, l in enumerate(multipliers)])
+
+        return y
+
+    def _back_substitute(self, y, x):
+        num_variables = self.dimension
+
+        for k in range(self.rank)[::-1]:
+            c = self.pivot_columns[k]
+            row = self.upper[k]
+            total = y[k] - sum([row[j]*x[j] for j in range(c+1, num_variables)])
+            x[c] = total / row[c]
+
+        return x
+
+    def solve_coordinates(self, b):
+        """
+            the basepoint of the solution as a list of numbers, or None when
+            the system is inconsistent for this right-hand side
+        """
+        y = self._forward_substitute(list(b))
+
+        for i in range(self.rank, self.num_equations):
+            if not is_near_zero(y[i]):
+                return None
+
+        return self._back_substitute(y, [self.number(0)] * self.dimension)
+
+    def solve_transpose_coordinates(self, c):
+        """
+            z with A^T*z = c, from U^T*w = c, L^T*v = w and z = P^T*v
+        """
+        n = self.dimension
+        if self.num_equations != n or self.rank != n:
+            raise Exception(self.TRANSPOSE_NEEDS_NONSINGULAR_MSG)
+        if len(c) != n:
+            raise Exception(self.RHS_MUST_MATCH_NUM_EQUATIONS_MSG)
+
+        upper = self.upper
+        w = [self.number(0)] * n
+        for i in range(n):
+            total = to_number(c[i], self.number) - sum([upper[k][i]*w[k] for k in range(i)])
+            w[i] = total / upper[i][i]
+
+        v = w
+        for i in range(n)[::-1]:
+            v[i] -= sum([self.lower[k][i]*v[k] for k in range(i+1, n)])
+
+        z = [self.number(0)] * n
+        for i, k in enumerate(self.permutation):
+            z[k] = v[i]
+        return z
+
+    def solve(self, b):
+        x = self.solve_coordinates(b)
+        if x is None:
+            return LinearSystem.NO_SOLUTIONS_MSG
+
+        return Parameterization(Vector(x, self.solution_number), list(self.direction_vectors))
+
+    def solve_many(self, B):
+        return [self.solve(b) for b in B]
+
+
+def mixed_precision_solve(system, max_refinements=10):
+    """
+        factorizes and solves in binary floats, then refines the answer
+        with residuals computed in Decimal until the corrections fall below
+        the Decimal context precision; falls back to full Decimal
+        elimination for rank-deficient or non-square systems and when
+        refinement stops converging
+    """
+    num_variables = system.dimension
+    if len(system) != num_variables:
+        return system.compute_solution()
+
+    factorization = LUFactorization(system, number=float)
+    if factorization.rank < num_variables:
+        return system.compute_solution()
+
+    coefficients = [[to_number(a, Decimal) for a in system._row_coefficients(i)]
+                    for i in range(num_variables)]
+    constant_terms = [to_number(system._constant_term(i), Decimal) for i in range(num_variables)]
+    tolerance = Decimal(10) ** (1 - getcontext().prec)
+    # once the corrections stop shrinking they are rounding noise of the
+    # Decimal residual; past this bound that noise means refinement failed
+    stagnation_tolerance = Decimal(10) ** (-(getcontext().prec // 2))
+
+    x = [Decimal(0)] * num_variables
+    residual = constant_terms
+    previous_correction = None
+
+    for iteration in range(max_refinements + 1):
+        correction = factorization.solve_coordinates([float(r) for r in residual])
+        x = [xi + Decimal(di) for xi, di in zip(x, correction)]
+
+        correction_norm = Decimal(max([abs(d) for d in correction]))
+        x_norm = max([abs(xi) for xi in x])
+        if correction_norm <= tolerance * x_norm:
+            return Parameterization(Vector(x, system.number), [])
+        if previous_correction is not None and correction_norm > previous_correction / 2:
+            if correction_norm <= stagnation_tolerance * x_norm:
+                return Parameterization(Vector(x, system.number), [])
+            break
+        previous_correction = correction_norm
+
+        residual = [k - sum([a*xi for a, xi in zip(row, x)])
+                    for row, k in zip(coefficients, constant_terms)]
+
+    return system.compute_solution()
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from linsys import _check_systems, _same_solution
+
+    for number in NUMERIC_BACKENDS:
+        for kind, system in _check_systems(number):
+            expected = system.compute_solution()
+            constant_terms = [system._constant_term(i) for i in range(len(system))]
+            if not _same_solution(LUFactorization(system).solve(constant_terms), expected):
+                print('solve {} {} failed'.format(number.__name__, kind))
+            if not _same_solution(mixed_precision_solve(system), expected):
+                print('mixed_precision_solve {} {} failed'.format(number.__name__, kind))
@@ -0,0 +1,224 @@
+import os
+import mmap
+import struct
+import tempfile
+from decimal import Decimal, getcontext
+
+from vector import Vector, is_near_zero
+from linsys import LinearSystem, Parameterization
+
+getcontext().prec = 30
+
+
+class OutOfCoreLinearSystem(object):
+    """
+        augmented matrix of float64 rows in a memory-mapped file, reduced by
+        left-looking block-row elimination: each block of rows_per_block
+        rows is read, updated by the earlier pivot rows one block at a time,
+        reduced among itself and written back, so at most two row blocks
+        are held in memory
+
+        every row picks its largest remaining entry as pivot, so the
+        unknowns left free in a rank-deficient system need not be the ones
+        compute_solution leaves free
+    """
+
+    ROW_MUST_MATCH_DIMENSION_MSG = 'Every row needs one coefficient per variable'
+
+    def __init__(self, path, num_equations, dimension, rows_per_block=64, temporary=False):
+        self.path = path
+        self.num_equations = num_equations
+        self.dimension = dimension
+        self.width = dimension + 1
+        self.rows_per_block = rows_per_block
+        self.temporary = temporary
+        self.pivot_columns = None
+
+        self.file = open(path, 'r+b')
+        # an empty file cannot be mapped; with no rows nothing is read
+        self.map = None
+        if num_equations:
+            self.map = mmap.mmap(self.file.fileno(), num_equations * self.width * 8)
+        self.row_format = '%dd' % self.width
+
+    @staticmethod
+    def from_rows(rows, dimension, path=None, rows_per_block=64):
+        """
+            writes (coefficients, constant term) pairs from any iterable to
+            the file one at a time; no rows at all is a valid system whose
+            solution is the whole space
+        """
+        temporary = path is None
+        if temporary:
+            handle, path = tempfile.mkstemp(suffix='.linsys')
+            os.close(handle)
+
+        row_format = '%dd' % (dimension + 1)
+        num_equations = 0
+        try:
+            with open(path, 'wb') as f:
+                for coefficients, constant_term in rows:
+                    values = [float(x) for x in coefficients]
+                    if len(values) != dimension:
+                        raise Exception(OutOfCoreLinearSystem.ROW_MUST_MATCH_DIMENSION_MSG)
+                    values.append(float(constant_term))
+                    f.write(struct.pack(row_format, *values))
+                    num_equations += 1
+
+            return OutOfCoreLinearSystem(path, num_equations, dimension, rows_per_block, temporary)
+        except BaseException:
+            if temporary:
+                os.remove(path)
+            raise
+
+    @staticmethod
+    def from_linear_system(system, path=None, rows_per_block=64):
+        rows = ((system._row_coefficients(i), system._constant_term(i)) for i in range(len(system)))
+        return OutOfCoreLinearSystem.from_rows(rows, system.dimension, path, rows_per_block)
+
+    def __len__(self):
+        return self.num_equations
+
+    def read_rows(self, first, last):
+        size = self.width * 8
+        return [list(struct.unpack_from(self.row_format, self.map, i * size))
+                for i in range(first, last)]
+
+    def write_rows(self, first, rows):
+        size = self.width * 8
+        for k, row in enumerate(rows):
+            struct.pack_into(self.row_format, self.map, (first + k) * size, *row)
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
+        if self.temporary:
+            os.remove(self.path)
+
+    def _eliminate(self, row, pivot_row, col):
+        multiplier = row[col] / pivot_row[col]
+        if multiplier:
+            row = [x - multiplier*y for x, y in zip(row, pivot_row)]
+            row[col] = 0.0
+        return row
+
+    def compute_triangular_form(self):
+        """
+            reduces the file in place and returns the pivot column of each
+            row, -1 for rows that became zero
+        """
+        if self.pivot_columns is not None:
+            return self.pivot_columns
+
+        n = self.dimension
+        step = self.rows_per_block
+        pivot_columns = []
+
+        for first in range(0, self.num_equations, step):
+            last = min(first + step, self.num_equations)
+            block = self.read_rows(first, last)
+
+            for previous in range(0, first, step):
+                pivot_rows = self.read_rows(previous, previous + step)
+                for k, pivot_row in enumerate(pivot_rows):
+                    col = pivot_columns[previous + k]
+                    if col >= 0:
+                        block = [self._eliminate(row, pivot_row, col) for row in block]
+
+            for i in range(len(block)):
+                for k in range(i):
+                    col = pivot_columns[first + k]
+                    if col >= 0:
+                        block[i] = self._eliminate(block[i], block[k], col)
+
+                row = block[i]
+                col = max(range(n), key=lambda j: abs(row[j]))
+                if is_near_zero(row[col]):
+                    block[i] = [0.0] * n + [row[n]]
+                    col = -1
+                pivot_columns.append(col)
+
+            self.write_rows(first, block)
+
+        self.pivot_columns = pivot_columns
+        return pivot_columns
+
+    def compute_solution(self, number=Decimal):
+        # number is the backend of the returned vectors
+        pivot_columns = self.compute_triangular_form()
+        n = self.dimension
+        step = self.rows_per_block
+
+        free_variables = sorted(set(range(n)) - set(pivot_columns))
+        # the basepoint, then one direction vector per free variable
+        vectors = [[0.0] * n for k in range(len(free_variables) + 1)]
+        for k, free_variable in enumerate(free_variables):
+            vectors[k + 1][free_variable] = 1.0
+
+        for last in range(self.num_equations, 0, -step):
+            first = max(last - step, 0)
+            block = self.read_rows(first, last)
+
+            for k in range(len(block))[::-1]:
+                row = block[k]
+                col = pivot_columns[first + k]
+                if col < 0:
+                    if not is_near_zero(row[n]):
+                        return LinearSystem.NO_SOLUTIONS_MSG
+                    continue
+
+                for v, x in enumerate(vectors):
+                    total = row[n] if v == 0 else 0.0
+                    x[col] = (total - sum([a*xj for a, xj in zip(row[:n], x) if a])) / row[col]
+
+        basepoint = Vector(vectors[0], number)
+        direction_vectors = [Vector(v, number) for v in vectors[1:]]
+        return Parameterization(basepoint, direction_vectors)
+
+
+def solve_out_of_core(system, path=None, rows_per_block=64):
+    out_of_core = OutOfCoreLinearSystem.from_linear_system(system, path, rows_per_block)
+    try:
+        return out_of_core.compute_solution(system.number)
+    finally:
+        out_of_core.close()
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from linsys import _check_systems, _same_solution
+
+    for number in NUMERIC_BACKENDS:
+        for kind, system in _check_systems(number):
+            solution = solve_out_of_core(system, rows_per_block=2)
+            if not _same_solution(solution, system.compute_solution()):
+                print('solve_out_of_core {} {} failed'.format(number.__name__, kind))
+
+    import shutil
+    import tempfile
+
+    tempfile.tempdir = tempfile.mkdtemp()
+    try:
+        try:
+            OutOfCoreLinearSystem.from_rows([([1, 2], 3), ([1], 2)], 2)
+            print('from_rows with a short row failed to raise')
+        except Exception as e:
+            if str(e) != OutOfCoreLinearSystem.ROW_MUST_MATCH_DIMENSION_MSG:
+                raise
+        if os.listdir(tempfile.tempdir):
+            print('from_rows left its temporary file behind')
+
+        empty = OutOfCoreLinearSystem.from_rows([], 3)
+        try:
+            solution = empty.compute_solution()
+        finally:
+            empty.close()
+        if not (len(empty) == 0 and solution.basepoint.is_zero() and
+                len(solution.direction_vectors) == 3):
+            print('from_rows with no rows failed')
+        if os.listdir(tempfile.tempdir):
+            print('from_rows with no rows left its temporary file behind')
+    finally:
+        shutil.rmtree(tempfile.tempdir)
+        tempfile.tempdir = None
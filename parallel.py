@@ -0,0 +1,168 @@
+from decimal import getcontext
+from multiprocessing import Pool, RawArray, cpu_count
+
+from vector import Vector, is_near_zero
+from linsys import Parameterization
+
+getcontext().prec = 30
+
+# the shared augmented matrix, set in each worker by _attach
+_shared = None
+
+
+def _attach(data, width):
+    global _shared
+    _shared = (data, width)
+
+
+def _update_rows(task):
+    # trailing update A22 -= L21 * U12 for rows first..last-1 of the shared
+    # matrix; the panel occupies columns start..stop-1 of those rows
+    first, last, start, stop = task
+    data, width = _shared
+    upper = [data[r*width + stop:(r+1)*width] for r in range(start, stop)]
+
+    for i in range(first, last):
+        offset = i * width
+        multipliers = data[offset + start:offset + stop]
+        row = data[offset + stop:offset + width]
+        for multiplier, pivot_row in zip(multipliers, upper):
+            if multiplier:
+                row = [x - multiplier*y for x, y in zip(row, pivot_row)]
+        data[offset + stop:offset + width] = row
+
+
+class ParallelElimination(object):
+    """
+        blocked right-looking LU with partial pivoting in binary floats on
+        an augmented matrix held in shared memory: each panel of block_size
+        columns is factored by the parent, then the row blocks of the
+        trailing matrix are updated by a pool of worker processes
+
+        square nonsingular systems only; anything else falls back to
+        compute_solution
+
+        the result has float precision whatever the backend: Decimal and
+        Fraction systems are converted to float, solved, and only the
+        solution is converted back to system.number
+
+        no speedup over one process has been measured yet; the only timings
+        so far come from a single-core machine, where extra processes cost
+        about as much as they save
+    """
+
+    def __init__(self, system, processes=None, block_size=64):
+        self.system = system
+        self.processes = processes or cpu_count()
+        self.block_size = block_size
+        self.num_equations = len(system)
+        self.dimension = system.dimension
+
+    def _load(self):
+        width = self.dimension + 1
+        data = RawArray('d', self.num_equations * width)
+        for i in range(self.num_equations):
+            row = [float(x) for x in self.system._row_coefficients(i)]
+            row.append(float(self.system._constant_term(i)))
+            data[i*width:(i+1)*width] = row
+        return data, width
+
+    def _factor_panel(self, data, width, start, stop):
+        n = self.num_equations
+        for c in range(start, stop):
+            p = max(range(c, n), key=lambda i: abs(data[i*width + c]))
+            if is_near_zero(data[p*width + c]):
+                return False
+
+            if p != c:
+                data[c*width:(c+1)*width], data[p*width:(p+1)*width] = (
+                    data[p*width:(p+1)*width], data[c*width:(c+1)*width])
+
+            pivot_row = data[c*width + c + 1:c*width + stop]
+            pivot = data[c*width + c]
+            for i in range(c+1, n):
+                offset = i * width
+                multiplier = data[offset + c] / pivot
+                data[offset + c] = multiplier
+                if multiplier:
+                    row = data[offset + c + 1:offset + stop]
+                    data[offset + c + 1:offset + stop] = [x - multiplier*y for x, y in zip(row, pivot_row)]
+
+        # U12 = L11^-1 * A12 for the panel rows
+        for r in range(start, stop):
+            offset = r * width
+            row = data[offset + stop:offset + width]
+            for c in range(start, r):
+                multiplier = data[offset + c]
+                if multiplier:
+                    pivot_row = data[c*width + stop:(c+1)*width]
+                    row = [x - multiplier*y for x, y in zip(row, pivot_row)]
+            data[offset + stop:offset + width] = row
+
+        return True
+
+    def _tasks(self, start, stop):
+        first = stop
+        remaining = self.num_equations - first
+        chunks = min(self.processes, remaining)
+        tasks = []
+        for k in range(chunks):
+            tasks.append((first + remaining*k // chunks, first + remaining*(k+1) // chunks, start, stop))
+        return tasks
+
+    def _back_substitute(self, data, width):
+        n = self.dimension
+        x = [0.0] * n
+        for i in range(n)[::-1]:
+            offset = i * width
+            total = data[offset + n] - sum([data[offset + j] * x[j] for j in range(i+1, n)])
+            x[i] = total / data[offset + i]
+        return x
+
+    def compute_solution(self):
+        n = self.dimension
+        if self.num_equations != n:
+            return self.system.compute_solution()
+
+        data, width = self._load()
+        pool = None
+        if self.processes > 1:
+            pool = Pool(self.processes, initializer=_attach, initargs=(data, width))
+        else:
+            _attach(data, width)
+
+        try:
+            for start in range(0, n, self.block_size):
+                stop = min(start + self.block_size, n)
+                if not self._factor_panel(data, width, start, stop):
+                    return self.system.compute_solution()
+
+                tasks = self._tasks(start, stop)
+                if not tasks:
+                    continue
+                if pool is None:
+                    for task in tasks:
+                        _update_rows(task)
+                else:
+                    pool.map(_update_rows, tasks)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        x = self._back_substitute(data, width)
+        return Parameterization(Vector(x, self.system.number), [])
+
+
+def solve_in_parallel(system, processes=None, block_size=64):
+    return ParallelElimination(system, processes, block_size).compute_solution()
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from linsys import _check_systems, _same_solution
+
+    for number in NUMERIC_BACKENDS:
+        for kind, system in _check_systems(number):
+            if not _same_solution(solve_in_parallel(system, processes=1), system.compute_solution()):
+                print('solve_in_parallel {} {} failed'.format(number.__name__, kind))
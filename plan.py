@@ -0,0 +1,155 @@
+from decimal import getcontext
+
+from vector import is_near_zero
+from linsys import LinearSystem, DenseLinearSystem, Parameterization
+
+getcontext().prec = 30
+
+
+class _RecordingLinearSystem(DenseLinearSystem):
+    # runs the normal compute_triangular_form / compute_rref while logging
+    # each step, with the update targets taken from the symbolic nonzero
+    # pattern so a cancellation in the recorded values cannot drop them
+
+    def __init__(self, planes):
+        DenseLinearSystem.__init__(self, planes)
+        self.pattern = [[not is_near_zero(x) for x in self._row_coefficients(i)]
+                        for i in range(len(self))]
+        self.operations = []
+
+    def swap_rows(self, row1, row2):
+        self.operations.append(('swap', row1, row2))
+        self.pattern[row1], self.pattern[row2] = self.pattern[row2], self.pattern[row1]
+        DenseLinearSystem.swap_rows(self, row1, row2)
+
+    def _targets(self, rows, row, col):
+        targets = [k for k in rows if self.pattern[k][col]]
+        for k in targets:
+            self.pattern[k] = [a or b for a, b in zip(self.pattern[k], self.pattern[row])]
+            self.pattern[k][col] = False
+        return targets
+
+    def clear_coefficients_below(self, row, col):
+        targets = self._targets(range(row+1, len(self)), row, col)
+        self.operations.append(('below', row, col, targets))
+        DenseLinearSystem.clear_coefficients_below(self, row, col)
+
+    def clear_coefficients_above(self, row, col):
+        targets = self._targets(range(row), row, col)
+        self.operations.append(('above', row, col, targets))
+        DenseLinearSystem.clear_coefficients_above(self, row, col)
+
+    def scale_row_to_make_coefficient_equal_one(self, row, col):
+        self.operations.append(('scale', row, col))
+        DenseLinearSystem.scale_row_to_make_coefficient_equal_one(self, row, col)
+
+
+class EliminationPlan(object):
+    """
+        the row swaps, pivots and update targets chosen by
+        compute_triangular_form and compute_rref for one system, replayable
+        as straight-line arithmetic on other systems with the same shape
+        and nonzero pattern; a replay that meets a near-zero pivot or a
+        different pivot structure falls back to compute_solution
+    """
+
+    def __init__(self, system):
+        recorder = _RecordingLinearSystem(system.planes)
+        self.input_pattern = [list(row) for row in recorder.pattern]
+        recorder.compute_rref(inplace=True)
+
+        self.num_equations = len(system)
+        self.dimension = system.dimension
+        self.operations = recorder.operations
+        self.pivot_indices = recorder.indices_of_first_nonzero_terms_in_each_row()
+        self.fell_back = False
+
+    def matches(self, system):
+        if len(system) != self.num_equations or system.dimension != self.dimension:
+            return False
+        for i, row_pattern in enumerate(self.input_pattern):
+            for allowed, x in zip(row_pattern, system._row_coefficients(i)):
+                if not allowed and not is_near_zero(x):
+                    return False
+        return True
+
+    def replay(self, system):
+        """
+            the reduced row echelon form of system as a DenseLinearSystem,
+            or None when the plan does not apply to it
+        """
+        if not self.matches(system):
+            return None
+
+        rref = system.to_dense()
+        data = rref.data
+        width = rref.width
+
+        for operation in self.operations:
+            kind = operation[0]
+
+            if kind == 'swap':
+                s1 = operation[1] * width
+                s2 = operation[2] * width
+                data[s1:s1+width], data[s2:s2+width] = data[s2:s2+width], data[s1:s1+width]
+                continue
+
+            row, col = operation[1], operation[2]
+            start = row * width
+            pivot = data[start + col]
+            pivot_row = data[start:start + width]
+
+            if kind == 'scale':
+                if is_near_zero(pivot):
+                    return None
+                beta = 1 / pivot
+                data[start:start + width] = [beta * x for x in pivot_row]
+                continue
+
+            if kind == 'below' and is_near_zero(pivot):
+                return None
+
+            for k in operation[3]:
+                target = k * width
+                if kind == 'below':
+                    alpha = -data[target + col] / pivot
+                else:
+                    alpha = -data[target + col]
+                data[target:target + width] = [alpha * x + y for x, y in
+                                               zip(pivot_row, data[target:target + width])]
+
+        rref._invalidate_caches()
+        for i, j in enumerate(self.pivot_indices):
+            if rref._first_nonzero_index(i) != j:
+                return None
+        rref._pivot_indices = list(self.pivot_indices)
+
+        return rref
+
+    def compute_solution(self, system):
+        rref = self.replay(system)
+        self.fell_back = rref is None
+        if rref is None:
+            return system.compute_solution()
+
+        try:
+            rref.raise_exception_if_contradictory_equation()
+        except Exception as e:
+            if str(e) == LinearSystem.NO_SOLUTIONS_MSG:
+                return str(e)
+            raise e
+
+        return Parameterization(rref.extract_basepoint_for_parameterization(),
+                                rref.extract_direction_vectors_for_parameterization())
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from linsys import _check_systems, _same_solution
+
+    for number in NUMERIC_BACKENDS:
+        for kind, system in _check_systems(number):
+            expected = system.compute_solution()
+            plan = EliminationPlan(system)
+            if not _same_solution(plan.compute_solution(system), expected) or plan.fell_back:
+                print('compute_solution {} {} failed'.format(number.__name__, kind))
@@ -1,6 +1,6 @@
 from decimal import Decimal, getcontext
 
-from vector import Vector
+from vector import Vector, to_number, is_near_zero
 
 getcontext().prec = 30
 
@@ -18,8 +18,8 @@ class Plane(object):
         self.normal_vector = normal_vector
 
         if not constant_term:
-            constant_term = Decimal('0')
-        self.constant_term = Decimal(constant_term)
+            constant_term = '0'
+        self.constant_term = to_number(constant_term, normal_vector.number)
 
         self.set_basepoint()
 
@@ -34,7 +34,7 @@ class Plane(object):
             initial_coefficient = self.get_nth_coefficient(initial_index)
 
             basepoint_coords[initial_index] = c/initial_coefficient
-            self.basepoint = Vector(basepoint_coords)
+            self.basepoint = Vector(basepoint_coords, n.number)
 
         except Exception as e:
             if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
@@ -57,7 +57,7 @@ class Plane(object):
                 return False
             else:
                 diff = self.constant_term - p.constant_term
-                return MyDecimal(diff).is_near_zero()
+                return is_near_zero(diff)
         elif p.normal_vector.is_zero():
             return False
 
@@ -127,7 +127,7 @@ class Plane(object):
     @staticmethod
     def first_nonzero_index(iterable):
         for k, item in enumerate(iterable):
-            if not MyDecimal(item).is_near_zero():
+            if not is_near_zero(item):
                 return k
         raise Exception(Plane.NO_NONZERO_ELTS_FOUND_MSG)
 
@@ -0,0 +1,223 @@
+import random
+from math import sqrt
+from decimal import getcontext
+
+from vector import Vector
+from leastsq import StreamingLeastSquares
+
+getcontext().prec = 30
+
+
+class SketchSolver(object):
+    """
+        sketch-and-solve least squares for very tall systems: the rows are
+        compressed by a seeded random projection (Gaussian, sparse sign or
+        subsampled randomized Hadamard), the small sketched problem is
+        solved by QR, and its R factor can precondition refinement steps on
+        the full rows
+
+        the sketch size trades accuracy for speed; everything runs in
+        binary floats on the nonzero coefficients
+    """
+
+    GAUSSIAN = 'gaussian'
+    SPARSE_SIGN = 'sparse sign'
+    SRHT = 'srht'
+    UNKNOWN_SKETCH_MSG = 'Unknown sketch kind'
+
+    # refinement stops once the preconditioned gradient is this small next
+    # to the one for x = 0; below it the steps only amplify rounding noise
+    REFINEMENT_TOLERANCE = 1e-14
+
+    def __init__(self, planes, sketch_size=None, kind=SPARSE_SIGN, seed=0, nonzeros_per_column=2):
+        if hasattr(planes, '_row_coefficients'):
+            coefficients = [planes._row_coefficients(i) for i in range(len(planes))]
+            constant_terms = [planes._constant_term(i) for i in range(len(planes))]
+            self.dimension = planes.dimension
+            self.number = planes.number
+        else:
+            coefficients = [p.normal_vector.coordinates for p in planes]
+            constant_terms = [p.constant_term for p in planes]
+            self.dimension = planes[0].dimension
+            self.number = planes[0].normal_vector.number
+
+        self.rows = [[(j, float(x)) for j, x in enumerate(row) if x] for row in coefficients]
+        self.constant_terms = [float(k) for k in constant_terms]
+
+        if sketch_size is None:
+            sketch_size = 4 * self.dimension
+        self.sketch_size = min(sketch_size, len(self.rows))
+        self.kind = kind
+        self.seed = seed
+        self.nonzeros_per_column = nonzeros_per_column
+
+    def sketch(self):
+        """
+            returns the sketched rows S*[A | b] as (coefficients, constant)
+            pairs
+        """
+        rng = random.Random(self.seed)
+        s = self.sketch_size
+        n = self.dimension
+        sketched = [[0.0] * (n + 1) for t in range(s)]
+
+        if self.kind == self.GAUSSIAN:
+            scale = 1 / sqrt(s)
+            for row, b in zip(self.rows, self.constant_terms):
+                for t in range(s):
+                    g = rng.gauss(0, scale)
+                    target = sketched[t]
+                    for j, a in row:
+                        target[j] += g * a
+                    target[n] += g * b
+
+        elif self.kind == self.SPARSE_SIGN:
+            k = min(self.nonzeros_per_column, s)
+            scale = 1 / sqrt(k)
+            for row, b in zip(self.rows, self.constant_terms):
+                for t in rng.sample(range(s), k):
+                    g = scale if rng.random() < 0.5 else -scale
+                    target = sketched[t]
+                    for j, a in row:
+                        target[j] += g * a
+                    target[n] += g * b
+
+        elif self.kind == self.SRHT:
+            m = 1
+            while m < len(self.rows):
+                m *= 2
+            columns = [[0.0] * m for j in range(n + 1)]
+            for i, (row, b) in enumerate(zip(self.rows, self.constant_terms)):
+                sign = 1.0 if rng.random() < 0.5 else -1.0
+                for j, a in row:
+                    columns[j][i] = sign * a
+                columns[n][i] = sign * b
+            for column in columns:
+                walsh_hadamard_transform(column)
+            scale = 1 / sqrt(s)
+            chosen = rng.sample(range(m), s)
+            for t, i in enumerate(chosen):
+                sketched[t] = [column[i] * scale for column in columns]
+
+        else:
+            raise Exception(self.UNKNOWN_SKETCH_MSG)
+
+        return [(row[:n], row[n]) for row in sketched]
+
+    def residual(self, x):
+        return [b - sum([a * x[j] for j, a in row]) for row, b in zip(self.rows, self.constant_terms)]
+
+    def compute_solution(self, refinement_steps=0):
+        """
+            returns (Vector, residual norm over all rows); refinement runs
+            conjugate gradient steps on the normal equations preconditioned
+            by the R factor of the sketch
+        """
+        n = self.dimension
+        factor = StreamingLeastSquares(n, number=float)
+        for coefficients, constant_term in self.sketch():
+            factor.add_row(coefficients, constant_term)
+        x = [float(v) for v in factor.compute_solution()[0].coordinates]
+        R = factor.R
+
+        def precondition(g):
+            # solve R^T y = g, then R d = y
+            y = [0.0] * n
+            for k in range(n):
+                y[k] = (g[k] - sum([R[i][k] * y[i] for i in range(k)])) / R[k][k]
+            d = [0.0] * n
+            for k in range(n)[::-1]:
+                d[k] = (y[k] - sum([R[k][j] * d[j] for j in range(k+1, n)])) / R[k][k]
+            return d
+
+        def transpose_apply(r):
+            g = [0.0] * n
+            for row, ri in zip(self.rows, r):
+                for j, a in row:
+                    g[j] += a * ri
+            return g
+
+        if refinement_steps:
+            r = self.residual(x)
+            g = transpose_apply(r)
+            z = precondition(g)
+            p = z
+            gamma = sum([gi * zi for gi, zi in zip(g, z)])
+
+            g_b = transpose_apply(self.constant_terms)
+            gamma_b = sum([gi * zi for gi, zi in zip(g_b, precondition(g_b))])
+            threshold = self.REFINEMENT_TOLERANCE ** 2 * max(gamma, gamma_b)
+
+        for step in range(refinement_steps):
+            if gamma <= threshold:
+                break
+            q = [sum([a * p[j] for j, a in row]) for row in self.rows]
+            q_norm_squared = sum([qi * qi for qi in q])
+            if q_norm_squared == 0:
+                break
+            alpha = gamma / q_norm_squared
+            x = [xi + alpha * pi for xi, pi in zip(x, p)]
+            r = [ri - alpha * qi for ri, qi in zip(r, q)]
+            g = transpose_apply(r)
+            z = precondition(g)
+            gamma, previous = sum([gi * zi for gi, zi in zip(g, z)]), gamma
+            p = [zi + gamma / previous * pi for zi, pi in zip(z, p)]
+
+        residual_norm = sqrt(sum([ri * ri for ri in self.residual(x)]))
+        return Vector(x, self.number), residual_norm
+
+
+def walsh_hadamard_transform(values):
+    # in place, orthonormal, len(values) must be a power of two
+    h = 1
+    m = len(values)
+    while h < m:
+        for start in range(0, m, 2 * h):
+            for i in range(start, start + h):
+                a, b = values[i], values[i + h]
+                values[i], values[i + h] = a + b, a - b
+        h *= 2
+    scale = 1 / sqrt(m)
+    for i in range(m):
+        values[i] *= scale
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from linsys import LinearSystem, Parameterization, _check_systems, _same_solution
+
+    # a consistent full-rank system is fitted exactly; otherwise the rows do
+    # not determine every variable
+    for number in NUMERIC_BACKENDS:
+        for kind, system in _check_systems(number):
+            expected = system.compute_solution()
+            try:
+                x, residual_norm = SketchSolver(system, kind=SketchSolver.GAUSSIAN).compute_solution(3)
+            except Exception as e:
+                if (system.solution_kind() == LinearSystem.UNIQUE_SOLUTION_MSG or
+                        str(e) != LinearSystem.INF_SOLUTIONS_MSG):
+                    print('compute_solution {} {} failed'.format(number.__name__, kind))
+                continue
+            if not _same_solution(Parameterization(x, []), expected):
+                print('compute_solution {} {} failed'.format(number.__name__, kind))
+
+    # refinement past convergence must stop instead of dividing by an
+    # underflowed step
+    from hyperplane import Hyperplane
+
+    def planes(rows):
+        return [Hyperplane(normal_vector=Vector(coefficients), constant_term=constant_term)
+                for coefficients, constant_term in rows]
+
+    overdetermined = planes([(['2'], '-2'), (['-1'], '5'), (['-4'], '2'),
+                             (['-1'], '2'), (['-2'], '1'), (['-2'], '-4')])
+    consistent = planes([(['1', '2'], '5'), (['3', '-1'], '1'), (['2', '2'], '6'),
+                         (['-1', '4'], '7'), (['5', '1'], '7'), (['0', '3'], '6')])
+    for refinement_steps in (7, 50):
+        x, residual_norm = SketchSolver(overdetermined).compute_solution(refinement_steps)
+        if abs(float(x.coordinates[0]) + 13.0 / 30) > 1e-12:
+            print('refinement_steps {} overdetermined failed'.format(refinement_steps))
+        for kind in (SketchSolver.GAUSSIAN, SketchSolver.SPARSE_SIGN, SketchSolver.SRHT):
+            x, residual_norm = SketchSolver(consistent, kind=kind).compute_solution(refinement_steps)
+            if residual_norm > 1e-12:
+                print('refinement_steps {} consistent {} failed'.format(refinement_steps, kind))
@@ -0,0 +1,191 @@
+from decimal import Decimal, getcontext
+
+from vector import Vector, to_number, is_near_zero
+from linsys import LinearSystem, Parameterization
+
+getcontext().prec = 30
+
+
+class SparseLinearSystem(object):
+    """
+        linear system stored as one {index: value} dict per equation, so
+        memory is proportional to the number of nonzero coefficients
+    """
+
+    PIVOT_THRESHOLD = Decimal('0.1')
+    CANCELLATION_TOLERANCE = Decimal('1e-25')
+
+    def __init__(self, rows, dimension, number=Decimal):
+        """
+            rows is an iterable of (pairs, constant_term) where pairs is an
+            iterable of (variable index, coefficient); elimination runs in
+            Decimal and number is the backend of the solution vectors
+        """
+        self.dimension = dimension
+        self.number = number
+        self.rows = []
+        self.constant_terms = []
+
+        for pairs, constant_term in rows:
+            row = {}
+            for j, value in pairs:
+                value = to_number(value, Decimal)
+                if not is_near_zero(value):
+                    row[j] = row.get(j, Decimal('0')) + value
+            self.rows.append(row)
+            self.constant_terms.append(to_number(constant_term, Decimal))
+
+    @staticmethod
+    def from_linear_system(system):
+        rows = [([(j, x) for j, x in enumerate(system._row_coefficients(i))
+                  if not is_near_zero(x)],
+                 system._constant_term(i))
+                for i in range(len(system))]
+        return SparseLinearSystem(rows, system.dimension, system.number)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def num_nonzeros(self):
+        return sum([len(row) for row in self.rows])
+
+    def column_graph(self):
+        neighbours = [set() for j in range(self.dimension)]
+        for row in self.rows:
+            columns = list(row)
+            for j in columns:
+                neighbours[j].update(columns)
+        for j in range(self.dimension):
+            neighbours[j].discard(j)
+        return neighbours
+
+    def reverse_cuthill_mckee_ordering(self):
+        neighbours = self.column_graph()
+        degree = [len(n) for n in neighbours]
+        visited = [False] * self.dimension
+        ordering = []
+
+        for start in sorted(range(self.dimension), key=lambda j: degree[j]):
+            if visited[start]:
+                continue
+            visited[start] = True
+            queue = [start]
+            head = 0
+            while head < len(queue):
+                j = queue[head]
+                head += 1
+                for k in sorted(neighbours[j], key=lambda k: degree[k]):
+                    if not visited[k]:
+                        visited[k] = True
+                        queue.append(k)
+            ordering.extend(queue)
+
+        return ordering[::-1]
+
+    def compute_triangular_form(self, ordering=None):
+        """
+            sparse forward elimination visiting the columns in a
+            fill-reducing order; returns (rows, constant_terms, pivots) where
+            pivots lists the (row, column) pairs in elimination order
+        """
+        if ordering is None:
+            ordering = self.reverse_cuthill_mckee_ordering()
+
+        rows = [dict(row) for row in self.rows]
+        constant_terms = list(self.constant_terms)
+
+        rows_in_column = [set() for j in range(self.dimension)]
+        for i, row in enumerate(rows):
+            for j in row:
+                rows_in_column[j].add(i)
+
+        used = set()
+        pivots = []
+
+        for c in ordering:
+            candidates = [i for i in rows_in_column[c] if i not in used]
+            eligible = [i for i in candidates if not is_near_zero(rows[i][c])]
+            if not eligible:
+                continue
+
+            # threshold partial pivoting, ties broken by the shortest row
+            largest = max([abs(rows[i][c]) for i in eligible])
+            r = min([i for i in eligible if abs(rows[i][c]) >= self.PIVOT_THRESHOLD * largest],
+                    key=lambda i: (len(rows[i]), i))
+            used.add(r)
+            pivots.append((r, c))
+
+            pivot_row = rows[r]
+            beta = pivot_row[c]
+
+            for k in candidates:
+                if k == r:
+                    continue
+                row = rows[k]
+                alpha = row[c] / beta
+                for j, value in pivot_row.items():
+                    update = alpha * value
+                    new_value = row.get(j, Decimal('0')) - update
+                    if j == c or abs(new_value) <= self.CANCELLATION_TOLERANCE * abs(update):
+                        if j in row:
+                            del row[j]
+                            rows_in_column[j].discard(k)
+                    else:
+                        if j not in row:
+                            rows_in_column[j].add(k)
+                        row[j] = new_value
+                constant_terms[k] = constant_terms[k] - alpha * constant_terms[r]
+
+        return rows, constant_terms, pivots
+
+    def compute_solution(self, ordering=None):
+        rows, constant_terms, pivots = self.compute_triangular_form(ordering)
+
+        for i, row in enumerate(rows):
+            if ([value for value in row.values() if not is_near_zero(value)] or
+                    is_near_zero(constant_terms[i])):
+                continue
+            return LinearSystem.NO_SOLUTIONS_MSG
+
+        num_variables = self.dimension
+        pivot_columns = set([c for r, c in pivots])
+
+        def back_substitute(x, homogeneous):
+            for r, c in pivots[::-1]:
+                row = rows[r]
+                if homogeneous:
+                    total = Decimal('0')
+                else:
+                    total = constant_terms[r]
+                for j, value in row.items():
+                    if j != c and x[j]:
+                        total -= value * x[j]
+                x[c] = total / row[c]
+            return Vector(x, self.number)
+
+        basepoint = back_substitute([0] * num_variables, False)
+
+        direction_vectors = []
+        for free_var in range(num_variables):
+            if free_var in pivot_columns:
+                continue
+            x = [0] * num_variables
+            x[free_var] = 1
+            direction_vectors.append(back_substitute(x, True))
+
+        return Parameterization(basepoint, direction_vectors)
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from linsys import _check_systems, _same_solution
+
+    for number in NUMERIC_BACKENDS:
+        for kind, system in _check_systems(number):
+            expected = system.compute_solution()
+            sparse = SparseLinearSystem.from_linear_system(system)
+            if not _same_solution(sparse.compute_solution(), expected):
+                print('compute_solution {} {} failed'.format(number.__name__, kind))
+            ordering = sparse.reverse_cuthill_mckee_ordering()
+            if not _same_solution(sparse.compute_solution(ordering), expected):
+                print('compute_solution with ordering {} {} failed'.format(number.__name__, kind))
@@ -0,0 +1,227 @@
+from decimal import Decimal, getcontext
+
+from vector import Vector, to_number, is_near_zero
+from linsys import Parameterization
+
+getcontext().prec = 30
+
+
+class StructuredSolver(object):
+    """
+        detects triangular, tridiagonal, symmetric positive definite and
+        banded coefficient matrices and solves them with back substitution,
+        the Thomas algorithm, banded Cholesky or banded LU; anything else,
+        and any structured solve that meets a near-zero pivot, goes through
+        the generic compute_solution
+    """
+
+    GENERAL = 'general'
+    UPPER_TRIANGULAR = 'upper triangular'
+    LOWER_TRIANGULAR = 'lower triangular'
+    TRIDIAGONAL = 'tridiagonal'
+    SYMMETRIC_POSITIVE_DEFINITE = 'symmetric positive definite'
+    BANDED = 'banded'
+
+    def __init__(self, system, max_bandwidth=None):
+        self.system = system
+        self.dimension = system.dimension
+        self.path = None
+
+        n = self.dimension
+        if max_bandwidth is None:
+            max_bandwidth = n // 4
+        self.max_bandwidth = max_bandwidth
+
+        if len(system) == n:
+            self.rows = [[to_number(x, Decimal) for x in system._row_coefficients(i)]
+                         for i in range(n)]
+            self.constant_terms = [to_number(system._constant_term(i), Decimal) for i in range(n)]
+        else:
+            self.rows = None
+
+    def bandwidths(self):
+        lower = 0
+        upper = 0
+        for i, row in enumerate(self.rows):
+            for j, x in enumerate(row):
+                if not is_near_zero(x):
+                    if i - j > lower:
+                        lower = i - j
+                    if j - i > upper:
+                        upper = j - i
+        return lower, upper
+
+    def is_symmetric(self):
+        rows = self.rows
+        for i in range(self.dimension):
+            for j in range(i):
+                if not is_near_zero(rows[i][j] - rows[j][i]):
+                    return False
+        return True
+
+    def detect_structure(self):
+        """
+            the candidate structures in the order they are tried
+        """
+        if self.rows is None:
+            return [self.GENERAL]
+
+        lower, upper = self.bandwidths()
+        if lower == 0:
+            return [self.UPPER_TRIANGULAR, self.GENERAL]
+        if upper == 0:
+            return [self.LOWER_TRIANGULAR, self.GENERAL]
+
+        candidates = []
+        if lower <= 1 and upper <= 1:
+            candidates.append(self.TRIDIAGONAL)
+        if lower == upper and self.is_symmetric():
+            candidates.append(self.SYMMETRIC_POSITIVE_DEFINITE)
+        if max(lower, upper) <= self.max_bandwidth:
+            candidates.append(self.BANDED)
+        candidates.append(self.GENERAL)
+
+        return candidates
+
+    def compute_solution(self):
+        solvers = {
+            self.UPPER_TRIANGULAR: self._solve_upper_triangular,
+            self.LOWER_TRIANGULAR: self._solve_lower_triangular,
+            self.TRIDIAGONAL: self._solve_tridiagonal,
+            self.SYMMETRIC_POSITIVE_DEFINITE: self._solve_cholesky,
+            self.BANDED: self._solve_banded,
+        }
+
+        for structure in self.detect_structure():
+            if structure == self.GENERAL:
+                break
+            x = solvers[structure]()
+            if x is not None:
+                self.path = structure
+                return Parameterization(Vector(x, self.system.number), [])
+
+        self.path = self.GENERAL
+        return self.system.compute_solution()
+
+    def _solve_upper_triangular(self):
+        n = self.dimension
+        rows = self.rows
+        x = [Decimal(0)] * n
+        for i in range(n)[::-1]:
+            if is_near_zero(rows[i][i]):
+                return None
+            total = self.constant_terms[i] - sum([rows[i][j] * x[j] for j in range(i+1, n)])
+            x[i] = total / rows[i][i]
+        return x
+
+    def _solve_lower_triangular(self):
+        n = self.dimension
+        rows = self.rows
+        x = [Decimal(0)] * n
+        for i in range(n):
+            if is_near_zero(rows[i][i]):
+                return None
+            total = self.constant_terms[i] - sum([rows[i][j] * x[j] for j in range(i)])
+            x[i] = total / rows[i][i]
+        return x
+
+    def _solve_tridiagonal(self):
+        n = self.dimension
+        rows = self.rows
+        c_prime = [Decimal(0)] * n
+        d_prime = [Decimal(0)] * n
+
+        for i in range(n):
+            a = rows[i][i-1] if i > 0 else Decimal(0)
+            c = rows[i][i+1] if i < n-1 else Decimal(0)
+            denominator = rows[i][i] - (a * c_prime[i-1] if i > 0 else 0)
+            if is_near_zero(denominator):
+                return None
+            c_prime[i] = c / denominator
+            d_prime[i] = (self.constant_terms[i] - (a * d_prime[i-1] if i > 0 else 0)) / denominator
+
+        x = [Decimal(0)] * n
+        for i in range(n)[::-1]:
+            x[i] = d_prime[i] - (c_prime[i] * x[i+1] if i < n-1 else 0)
+        return x
+
+    def _solve_cholesky(self):
+        # A = L*L^T, with L restricted to the band of A
+        n = self.dimension
+        rows = self.rows
+        b = self.bandwidths()[0]
+        L = [[Decimal(0)] * n for i in range(n)]
+
+        for i in range(n):
+            for j in range(max(0, i-b), i+1):
+                total = rows[i][j] - sum([L[i][k] * L[j][k] for k in range(max(0, i-b), j)])
+                if i == j:
+                    if total <= 0 or is_near_zero(total):
+                        return None
+                    L[i][i] = total.sqrt()
+                else:
+                    L[i][j] = total / L[j][j]
+
+        y = [Decimal(0)] * n
+        for i in range(n):
+            total = self.constant_terms[i] - sum([L[i][k] * y[k] for k in range(max(0, i-b), i)])
+            y[i] = total / L[i][i]
+
+        x = [Decimal(0)] * n
+        for i in range(n)[::-1]:
+            total = y[i] - sum([L[k][i] * x[k] for k in range(i+1, min(n, i+b+1))])
+            x[i] = total / L[i][i]
+        return x
+
+    def _solve_banded(self):
+        # LU without pivoting keeps the band; a near-zero pivot falls back
+        n = self.dimension
+        lower, upper = self.bandwidths()
+        rows = [list(row) for row in self.rows]
+        constant_terms = list(self.constant_terms)
+
+        for k in range(n):
+            pivot = rows[k][k]
+            if is_near_zero(pivot):
+                return None
+            for i in range(k+1, min(n, k+lower+1)):
+                multiplier = rows[i][k] / pivot
+                if not multiplier:
+                    continue
+                for j in range(k+1, min(n, k+upper+1)):
+                    rows[i][j] -= multiplier * rows[k][j]
+                rows[i][k] = Decimal(0)
+                constant_terms[i] -= multiplier * constant_terms[k]
+
+        x = [Decimal(0)] * n
+        for i in range(n)[::-1]:
+            total = constant_terms[i] - sum([rows[i][j] * x[j] for j in range(i+1, min(n, i+upper+1))])
+            x[i] = total / rows[i][i]
+        return x
+
+
+def solve_structured(system, max_bandwidth=None):
+    """
+        returns (solution, path) where path names the solver that was used
+    """
+    solver = StructuredSolver(system, max_bandwidth)
+    solution = solver.compute_solution()
+    return solution, solver.path
+
+
+if __name__ == '__main__':
+    from vector import NUMERIC_BACKENDS
+    from hyperplane import Hyperplane
+    from linsys import LinearSystem, _check_systems, _same_solution
+
+    for number in NUMERIC_BACKENDS:
+        triangular = LinearSystem([
+            Hyperplane(normal_vector=Vector(['2', '1', '-1'], number), constant_term='3'),
+            Hyperplane(normal_vector=Vector(['0', '3', '1'], number), constant_term='1'),
+            Hyperplane(normal_vector=Vector(['0', '0', '4'], number), constant_term='2')])
+        for kind, system in _check_systems(number) + [('triangular', triangular)]:
+            solution, path = solve_structured(system)
+            if not _same_solution(solution, system.compute_solution()):
+                print('solve_structured {} {} failed'.format(number.__name__, kind))
+        if solve_structured(triangular)[1] != StructuredSolver.UPPER_TRIANGULAR:
+            print('solve_structured {} path failed'.format(number.__name__))
@@ -1,21 +1,106 @@
+import threading
 from math import sqrt, acos, pi
 from decimal import Decimal, getcontext
+from fractions import Fraction
 
 getcontext().prec = 30
 
+# number types a Vector can hold its coordinates in: float for speed,
+# Decimal (the default) at the context precision, Fraction for exactness
+# every LinearSystem solver accepts each of them and returns vectors in the
+# system's backend; solvers with their own arithmetic convert on the way in
+NUMERIC_BACKENDS = (Decimal, float, Fraction)
+UNKNOWN_NUMERIC_BACKEND_MSG = 'The numeric backend must be Decimal, float or Fraction'
+
+_backend = threading.local()
+
+
+def get_numeric_backend():
+    return getattr(_backend, 'number', Decimal)
+
+
+def set_numeric_backend(number):
+    if number not in NUMERIC_BACKENDS:
+        raise Exception(UNKNOWN_NUMERIC_BACKEND_MSG)
+    _backend.number = number
+
+
+class numeric_backend(object):
+    """
+        with numeric_backend(float): vectors built inside the block without
+        an explicit number default to float; per thread, like the Decimal
+        context
+    """
+
+    def __init__(self, number):
+        self.number = number
+
+    def __enter__(self):
+        self.previous = get_numeric_backend()
+        set_numeric_backend(self.number)
+        return self.number
+
+    def __exit__(self, *exc_info):
+        set_numeric_backend(self.previous)
+
+
+def to_number(x, number):
+    if type(x) is number:
+        return x
+    if number is Decimal and isinstance(x, Fraction):
+        return Decimal(x.numerator) / Decimal(x.denominator)
+    return number(x)
+
+
+def is_near_zero(x, eps=1e-10):
+    return abs(x) < eps
+
+
+def integer_square_root(n):
+    # floor of the square root of a nonnegative int, by Newton's method
+    if n < 2:
+        return n
+    x = 1 << ((n.bit_length() + 1) // 2)
+    while True:
+        y = (x + n // x) // 2
+        if y >= x:
+            return x
+        x = y
+
+
+def square_root(x):
+    if type(x) is float:
+        return sqrt(x)
+    if isinstance(x, Decimal):
+        return x.sqrt()
+    if isinstance(x, Fraction):
+        # exact for perfect squares, otherwise as close as a float gets
+        root = Fraction(integer_square_root(x.numerator), integer_square_root(x.denominator))
+        if root * root == x:
+            return root
+        return Fraction(sqrt(x))
+    return sqrt(x)
+
 
 class Vector():
 
-    def __init__(self, coordinates):
+    CANNOT_NORMALIZE_ZERO_VECTOR_MSG = 'cannot normalize the zero vector'
+    NO_UNIQUE_PARALLEL_COMPONENT_MSG = 'no unique parallel component'
+    ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG = 'only defined in 2 and 3 dimensions'
 
-        self.CANNOT_NORMALIZE_ZERO_VECTOR_MSG = 'cannot normalize the zero vector'
-        self.NO_UNIQUE_PARALLEL_COMPONENT_MSG = 'no unique parallel component'
-        self.ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG = 'only defined in 2 and 3 dimensions'
+    def __init__(self, coordinates, number=None):
+
+        if number is None:
+            number = get_numeric_backend()
+        elif number not in NUMERIC_BACKENDS:
+            raise Exception(UNKNOWN_NUMERIC_BACKEND_MSG)
+        self.number = number
 
         try:
             if not coordinates:
                 raise ValueError
-            self.coordinates = tuple([Decimal(x) for x in coordinates])
+            self.coordinates = tuple([x if type(x) is number else to_number(x, number)
+                                      for x in coordinates])
             self.dimension = len(coordinates)
         except ValueError:
             raise ValueError('The coordinates must not be empty')
@@ -23,36 +108,43 @@ class Vector():
         except TypeError:
             raise TypeError('The coordinates must not be an iterable')
 
+    def _coordinates_of(self, v):
+        # the other vector's coordinates in this vector's backend
+        if v.number is self.number:
+            return v.coordinates
+        return [to_number(x, self.number) for x in v.coordinates]
+
     def plus(self, v):
         new_coordinates = [x+y for x,
-                           y in zip(self.coordinates, v.coordinates)]
-        return Vector(new_coordinates)
+                           y in zip(self.coordinates, self._coordinates_of(v))]
+        return Vector(new_coordinates, self.number)
 
     def minus(self, v):
         new_coordinates = [x-y for x,
-                           y in zip(self.coordinates, v.coordinates)]
-        return Vector(new_coordinates)
+                           y in zip(self.coordinates, self._coordinates_of(v))]
+        return Vector(new_coordinates, self.number)
 
     def times_scalar(self, c):
-        new_coordinates = [Decimal(c)*x for x in self.coordinates]
-        return Vector(new_coordinates)
+        c = to_number(c, self.number)
+        new_coordinates = [c*x for x in self.coordinates]
+        return Vector(new_coordinates, self.number)
 
     def magnitude(self):
         coordinates_squared = [x**2 for x in self.coordinates]
-        return Decimal(sqrt(sum(coordinates_squared)))
+        return square_root(to_number(sum(coordinates_squared), self.number))
 
     def normalized(self):
         try:
             magnitude = self.magnitude()
 
-            return self.times_scalar(Decimal('1.0')/magnitude)
+            return self.times_scalar(1/magnitude)
 
         except ZeroDivisionError:
-            raise Exception(CANNOT_NORMALIZE_ZERO_VECTOR_MSG)
+            raise Exception(self.CANNOT_NORMALIZE_ZERO_VECTOR_MSG)
 
     def dot(self, v):
-        result = sum([x*y for x, y in zip(self.coordinates, v.coordinates)])
-        return Decimal(result)
+        result = sum([x*y for x, y in zip(self.coordinates, self._coordinates_of(v))])
+        return to_number(result, self.number)
 
     def angle_with(self, v, in_degrees=False):
         try:
@@ -112,18 +204,18 @@ class Vector():
     def cross(self, v):
         try:
             x1, y1, z1 = self.coordinates
-            x2, y2, z2 = v.coordinates
+            x2, y2, z2 = self._coordinates_of(v)
             new_coordinates = [
                 y1*z2 - y2*z1,
                 -(x1*z2 - x2*z1),
                 x1*y2 - x2*y1
             ]
-            return Vector(new_coordinates)
+            return Vector(new_coordinates, self.number)
         except ValueError as e:
             msg = str(e)
             if msg == 'need more than 2 values to unpack':
-                self_embedded_in_R3 = Vector(self.coordinates + (0,))
-                v_embedded_in_R3 = Vector(v.coordinates + (0,))
+                self_embedded_in_R3 = Vector(self.coordinates + (0,), self.number)
+                v_embedded_in_R3 = Vector(v.coordinates + (0,), self.number)
                 return self_embedded_in_R3.cross(v_embedded_in_R3)
             elif (msg == 'too many values to unpack' or msg == 'need more than 1 value o unpack'):
                 raise Exception(self.ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG)
@@ -131,7 +223,7 @@ class Vector():
                 raise e
 
     def area_of_triangle_with(self, v):
-        return self.area_of_parallelogram_with(v)/Decimal("2.0")
+        return self.area_of_parallelogram_with(v)/self.number(2)
 
     def area_of_parallelogram_with(self, v):
         cross_product = self.cross(v)